@@ -1,297 +1,1188 @@
-from queue import Queue
+from array import array
+from collections import deque
 import heapq
 import time
-import psutil
 
 from AIMetrics import AIMetrics
+from PathCache import PathCache
+from Instrumentation import Instrumentation
+from IncrementalPlanner import IncrementalPlanner
+from HierarchicalPlanner import HierarchicalPlanner
+from JunctionGraph import JunctionGraph
+from SearchWorkspace import SearchWorkspace
 
 
 class AI:
+    # Button label -> solver method, used to dispatch from the view
+    ALGORITHMS = {
+        "BFS": "bfs",
+        "DFS": "dfs",
+        "A*": "a_star",
+        "Bi-BFS": "bidirectional_bfs",
+        "Bi-A*": "bidirectional_a_star",
+        "JPS": "jump_point_search",
+        "Dijkstra": "dijkstra",
+        "Terrain A*": "terrain_a_star",
+        "Hint": "hint",
+        "D* Lite": "d_star_lite",
+        "HPA*": "hierarchical_a_star",
+        "Junction": "junction_search",
+    }
+
     def __init__(self, start_position, goal_position):
         """
         Initialize the AI with starting and goal positions.
-        
+
         :param start_position: Tuple (x, y) for the starting position.
         :param goal_position: Tuple (x, y) for the goal position.
         """
         self.start_position = start_position
         self.goal_position = goal_position
+        self._distance_field = None  # (maze version, goal distance array), see distance_field()
+        self.cache = PathCache()     # Results of solve(), invalidated whenever the maze version changes
+        self._planner = None         # IncrementalPlanner kept alive between d_star_lite() calls
+        self._hierarchy = None       # HierarchicalPlanner for the current maze version
+        self._junctions = None       # JunctionGraph for the current maze version
+        self.workspace = SearchWorkspace()  # Per-cell search arrays reused by every query, see _workspace()
+        self.instrumentation = Instrumentation()  # Set its level to measure phases, frontier and memory
+
+    def solve(self, algorithm, start_position, maze):
+        """
+        Run the solver registered under an algorithm label.
+
+        Results are cached per (maze version, start, goal, algorithm), so asking
+        again without moving, or switching back to an earlier algorithm, returns
+        the stored AIMetrics instead of searching again.
+
+        :param algorithm: Key of AI.ALGORITHMS, e.g. "BFS" or "Bi-A*".
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance.
+        :return: AIMetrics of the search.
+        """
+        metrics = self.cache.get(maze.version, start_position, self.goal_position, algorithm)
+        if metrics is None:
+            metrics = getattr(self, self.ALGORITHMS[algorithm])(start_position, maze)
+            # Stored under the version after the search, which may have forced the goal open
+            self.cache.put(maze.version, start_position, self.goal_position, algorithm, metrics)
+        return metrics
 
     # ------------------------------
     # Breadth-First Search (BFS)
     # ------------------------------
     def bfs(self, start_position, maze):
-        if self._is_path_blocked(start_position, maze):
-            return AIMetrics("BFS", [], 0, 0, 0, 0, 0, 0)
-
-        if not self.validate_connectivity(maze):
-            return AIMetrics("BFS", [], 0, 0, 0, 0, 0, 0)
-
         """
         Perform Breadth-First Search (BFS) to find the shortest path in an unweighted maze.
-        
+
         BFS explores all possible paths layer by layer, ensuring the shortest path is found.
-        
-        :param maze: 2D list where 0 = open path, 1 = wall.
-        :return: List of positions representing the shortest path from start to goal.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance whose flat grid is searched.
+        :return: AIMetrics with the shortest path from start to goal.
         """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("BFS", [], 0, 0, 0, 0, 0, 0))
+
+        if not self.validate_connectivity(maze, start_position):
+            return probe.finish(AIMetrics("BFS", [], 0, 0, 0, 0, 0, 0))
+        probe.lap("connectivity")
 
         # Metrics initialization
         start_time = time.perf_counter()
-        process = psutil.Process()
-        cpu_before = process.cpu_percent()
-        memory_before = process.memory_info().rss
+        track = probe.tracking  # Frontier size is only sampled while instrumentation is on
+        frontier_peak = 0
         nodes_explored = 0
 
-        rows, cols = len(maze), len(maze[0])
-        queue = Queue()
-        queue.put(start_position)  # Queue holds positions to explore
-        visited = set()                # Keep track of visited positions
-        visited.add(start_position)
-        parent_map = {}                # Map each position to its parent for path reconstruction
+        offsets, targets = maze.adjacency()
+        cols = maze.cols
+        start = start_position[1] * cols + start_position[0]
+        goal = self.goal_position[1] * cols + self.goal_position[0]
 
-        while not queue.empty():
-            current_position = queue.get()
+        workspace = self._workspace(maze)
+        mark = workspace.begin()             # Cells stamped with an older mark count as unvisited
+        stamp, parent = workspace.stamp[0], workspace.parent[0]
+        queue = deque([start])               # Queue holds cell indices to explore
+        stamp[start] = mark
+        parent[start] = -1                   # Parent index of each cell for path reconstruction
+
+        while queue:
+            if track and len(queue) > frontier_peak:
+                frontier_peak = len(queue)
+            current = queue.popleft()
             nodes_explored += 1  # Count visited nodes
 
             # Check if we've reached the goal
-            if current_position == self.goal_position:
-                path = self._reconstruct_path(parent_map)
-                path_length = self._calculate_path_length(path)
-                cpu_after = process.cpu_percent()
-                memory_after = process.memory_info().rss
+            if current == goal:
+                probe.lap("search")
+                path = self._reconstruct_path(parent, goal, cols)
+                path_length = self._calculate_path_length(path, maze)
+                probe.lap("reconstruction")
                 execution_time = time.perf_counter() - start_time
 
-                return AIMetrics(
+                return probe.finish(AIMetrics(
                     algorithm_name="BFS",
                     path=path,
                     steps=len(path),
                     nodes_explored=nodes_explored,
                     path_length=path_length,
                     execution_time=execution_time,
-                    cpu_usage=cpu_after - cpu_before,
-                    memory_usage=(memory_after - memory_before) / 1024 ** 2  # Convert to MB
-                )
-
-            # Explore all valid neighbors
-            for neighbor in self._get_neighbors(current_position, maze, rows, cols):
-                if neighbor not in visited:
-                    queue.put(neighbor)
-                    visited.add(neighbor)
-                    parent_map[neighbor] = current_position  # Track how we reached this position
-
-        return AIMetrics("BFS", [], 0, nodes_explored, 0, 0, 0, 0)
+                    cpu_usage=0,
+                    memory_usage=0,
+                ), frontier_peak)
+
+            # Explore all open neighbors from the shared adjacency index
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if stamp[neighbor] < mark:
+                    queue.append(neighbor)
+                    stamp[neighbor] = mark
+                    parent[neighbor] = current  # Track how we reached this cell
+
+        probe.lap("search")
+        return probe.finish(AIMetrics("BFS", [], 0, nodes_explored, 0, 0, 0, 0), frontier_peak)
     # ------------------------------
     # Depth-First Search (DFS)
     # ------------------------------
     def dfs(self, start_position, maze):
-        if self._is_path_blocked(start_position, maze):
-            return AIMetrics("DFS", [], 0, 0, 0, 0, 0, 0)
-
-        if not self.validate_connectivity(maze):
-            return AIMetrics("DFS", [], 0, 0, 0, 0, 0, 0)
-
         """
         Perform Depth-First Search (DFS) to find a path in the maze.
-        
+
         DFS explores as far as possible along one path before backtracking.
-        
-        :param maze: 2D list where 0 = open path, 1 = wall.
-        :return: List of positions representing a path from start to goal.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance whose flat grid is searched.
+        :return: AIMetrics with a path from start to goal.
         """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("DFS", [], 0, 0, 0, 0, 0, 0))
+
+        if not self.validate_connectivity(maze, start_position):
+            return probe.finish(AIMetrics("DFS", [], 0, 0, 0, 0, 0, 0))
+        probe.lap("connectivity")
+
         # Metrics initialization
         start_time = time.perf_counter()
-        process = psutil.Process()
-        cpu_before = process.cpu_percent()
-        memory_before = process.memory_info().rss
+        track = probe.tracking  # Frontier size is only sampled while instrumentation is on
+        frontier_peak = 0
         nodes_explored = 0
 
-        rows, cols = len(maze), len(maze[0])
-        stack = [start_position]  # Stack for DFS
-        visited = set()               # Keep track of visited positions
-        parent_map = {}               # Map each position to its parent for path reconstruction
+        offsets, targets = maze.adjacency()
+        cols = maze.cols
+        start = start_position[1] * cols + start_position[0]
+        goal = self.goal_position[1] * cols + self.goal_position[0]
+
+        workspace = self._workspace(maze)
+        visited = workspace.begin() + 1      # Stamp of cells already expanded by this search
+        stamp, parent = workspace.stamp[0], workspace.parent[0]
+        stack = [start]                      # Stack for DFS
+        parent[start] = -1                   # Parent index of each cell for path reconstruction
 
         while stack:    # Continue until all paths are explored
-            current_position = stack.pop()
+            if track and len(stack) > frontier_peak:
+                frontier_peak = len(stack)
+            current = stack.pop()
             nodes_explored += 1  # Count visited nodes
-            
+
             # Check if we've reached the goal
-            if current_position == self.goal_position:
-                path = self._reconstruct_path(parent_map)
-                path_length = self._calculate_path_length(path)
-                cpu_after = process.cpu_percent()
-                memory_after = process.memory_info().rss
+            if current == goal:
+                probe.lap("search")
+                path = self._reconstruct_path(parent, goal, cols)
+                path_length = self._calculate_path_length(path, maze)
+                probe.lap("reconstruction")
                 execution_time = time.perf_counter() - start_time
 
-                return AIMetrics(
+                return probe.finish(AIMetrics(
                     algorithm_name="DFS",
                     path=path,
                     steps=len(path),
                     nodes_explored=nodes_explored,
                     path_length=path_length,
                     execution_time=execution_time,
-                    cpu_usage=cpu_after - cpu_before,
-                    memory_usage=(memory_after - memory_before) / 1024 ** 2  # Convert to MB
-                )
-
-            # Explore all valid neighbors
-            if current_position not in visited:
-                visited.add(current_position)
-                for neighbor in self._get_neighbors(current_position, maze, rows, cols):
-                    if neighbor not in visited:
+                    cpu_usage=0,
+                    memory_usage=0,
+                ), frontier_peak)
+
+            # Explore all open neighbors from the shared adjacency index
+            if stamp[current] != visited:
+                stamp[current] = visited
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if stamp[neighbor] != visited:
                         stack.append(neighbor)
-                        parent_map[neighbor] = current_position  # Track how we reached this position
+                        parent[neighbor] = current  # Track how we reached this cell
 
-        return AIMetrics("DFS", [], 0, nodes_explored, 0, 0, 0, 0)
+        probe.lap("search")
+        return probe.finish(AIMetrics("DFS", [], 0, nodes_explored, 0, 0, 0, 0), frontier_peak)
 
     # ------------------------------
     # A* Search
     # ------------------------------
     def a_star(self, start_position, maze):
-        if self._is_path_blocked(start_position, maze):
-            return AIMetrics("A*", [], 0, 0, 0, 0, 0, 0)
-
-        if not self.validate_connectivity(maze):
-            return AIMetrics("A*", [], 0, 0, 0, 0, 0, 0)
-
         """
         Perform A* Search to find the optimal path using a heuristic.
-        
+
         A* combines the cost of the path so far (g) and an estimate to the goal (h).
-        
-        :param maze: 2D list where 0 = open path, 1 = wall.
-        :return: List of positions representing the optimal path from start to goal.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance whose flat grid is searched.
+        :return: AIMetrics with the optimal path from start to goal.
         """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("A*", [], 0, 0, 0, 0, 0, 0))
+
+        if not self.validate_connectivity(maze, start_position):
+            return probe.finish(AIMetrics("A*", [], 0, 0, 0, 0, 0, 0))
+        probe.lap("connectivity")
+
         # Metrics initialization
         start_time = time.perf_counter()
-        process = psutil.Process()
-        cpu_before = process.cpu_percent()
-        memory_before = process.memory_info().rss
+        track = probe.tracking  # Frontier size is only sampled while instrumentation is on
+        frontier_peak = 0
         nodes_explored = 0
 
-        rows, cols = len(maze), len(maze[0])
-        open_set = []  # Priority queue for positions to explore
-        heapq.heappush(open_set, (0, start_position))  # (priority, position)
-        g_cost = {start_position: 0}  # Cost of the path from start to a position
-        f_cost = {start_position: self._heuristic(start_position)}  # Total estimated cost
-        parent_map = {}  # Map each position to its parent for path reconstruction
+        offsets, targets = maze.adjacency()
+        cols = maze.cols
+        start = start_position[1] * cols + start_position[0]
+        goal_x, goal_y = self.goal_position
+        goal = goal_y * cols + goal_x
+
+        open_set = []  # Priority queue of (f cost, cell index)
+        heapq.heappush(open_set, (self._heuristic(start_position), start))
+        workspace = self._workspace(maze)
+        mark = workspace.begin()             # Cells stamped mark have a g cost, mark + 1 are closed
+        closed = mark + 1
+        stamp, g_cost, parent = workspace.stamp[0], workspace.cost[0], workspace.parent[0]
+        stamp[start] = mark
+        g_cost[start] = 0                    # Cost of the path from start to a cell
+        parent[start] = -1                   # Parent index of each cell for path reconstruction
 
         while open_set:
-            _, current_position = heapq.heappop(open_set)
+            if track and len(open_set) > frontier_peak:
+                frontier_peak = len(open_set)
+            _, current = heapq.heappop(open_set)
+            if stamp[current] == closed:
+                continue  # Stale queue entry superseded by a cheaper one
+            stamp[current] = closed
             nodes_explored += 1  # Count visited nodes
 
             # Check if we've reached the goal
-            if current_position == self.goal_position:
-                path = self._reconstruct_path(parent_map)
-                path_length = self._calculate_path_length(path)
-                cpu_after = process.cpu_percent()
-                memory_after = process.memory_info().rss
+            if current == goal:
+                probe.lap("search")
+                path = self._reconstruct_path(parent, goal, cols)
+                path_length = self._calculate_path_length(path, maze)
+                probe.lap("reconstruction")
                 execution_time = time.perf_counter() - start_time
 
-                return AIMetrics(
+                return probe.finish(AIMetrics(
                     algorithm_name="A*",
                     path=path,
                     steps=len(path),
                     nodes_explored=nodes_explored,
                     path_length=path_length,
                     execution_time=execution_time,
-                    cpu_usage=cpu_after - cpu_before,
-                    memory_usage=(memory_after - memory_before) / 1024 ** 2  # Convert to MB
-                )
-            
-
-            # Explore all valid neighbors
-            for neighbor in self._get_neighbors(current_position, maze, rows, cols):
-                tentative_g_cost = g_cost[current_position] + 1  # Distance to neighbor
-                if neighbor not in g_cost or tentative_g_cost < g_cost[neighbor]:
-                    # Update costs and priority queue
+                    cpu_usage=0,
+                    memory_usage=0,
+                ), frontier_peak)
+
+
+            # Explore all open neighbors from the shared adjacency index
+            tentative_g_cost = g_cost[current] + 1  # Distance to neighbor
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if stamp[neighbor] != closed:
+                    if stamp[neighbor] < mark or tentative_g_cost < g_cost[neighbor]:
+                        # Update costs and priority queue
+                        stamp[neighbor] = mark
+                        g_cost[neighbor] = tentative_g_cost
+                        ny, nx = divmod(neighbor, cols)
+                        f_cost = tentative_g_cost + abs(nx - goal_x) + abs(ny - goal_y)
+                        heapq.heappush(open_set, (f_cost, neighbor))
+                        parent[neighbor] = current  # Track how we reached this cell
+
+        probe.lap("search")
+        return probe.finish(AIMetrics("A*", [], 0, nodes_explored, 0, 0, 0, 0), frontier_peak)
+
+
+    # ------------------------------
+    # Bidirectional BFS
+    # ------------------------------
+    def bidirectional_bfs(self, start_position, maze):
+        """
+        Perform BFS from the start and from the goal at the same time.
+
+        Each round expands one full layer of the smaller frontier. When a layer
+        touches a cell already reached from the other side, the best meeting
+        point in that layer gives the shortest path and the two parent chains
+        are joined there.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance whose flat grid is searched.
+        :return: AIMetrics with the shortest path from start to goal.
+        """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("Bi-BFS", [], 0, 0, 0, 0, 0, 0))
+
+        if not self.validate_connectivity(maze, start_position):
+            return probe.finish(AIMetrics("Bi-BFS", [], 0, 0, 0, 0, 0, 0))
+        probe.lap("connectivity")
+
+        # Metrics initialization
+        start_time = time.perf_counter()
+        track = probe.tracking  # Frontier size is only sampled while instrumentation is on
+        frontier_peak = 0
+        explored = [0, 0]  # Nodes expanded by the forward and backward search
+
+        offsets, targets = maze.adjacency()
+        cols = maze.cols
+        start = start_position[1] * cols + start_position[0]
+        goal = self.goal_position[1] * cols + self.goal_position[0]
+
+        # Per direction: distance from its root (valid where stamped mark) and parent index
+        workspace = self._workspace(maze)
+        mark = workspace.begin(sides=2)
+        stamp, distance, parent = workspace.stamp, workspace.cost, workspace.parent
+        for side, root in ((0, start), (1, goal)):
+            stamp[side][root] = mark
+            distance[side][root] = 0
+            parent[side][root] = -1
+        frontier = ([start], [goal])
+        meeting = start if start == goal else -1
+
+        while meeting < 0 and frontier[0] and frontier[1]:
+            if track:
+                frontier_peak = max(frontier_peak, len(frontier[0]) + len(frontier[1]))
+            side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+            own_stamp, own_distance, own_parent = stamp[side], distance[side], parent[side]
+            other_stamp, other_distance = stamp[1 - side], distance[1 - side]
+            best = -1
+            next_layer = []
+            for current in frontier[side]:
+                explored[side] += 1
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if own_stamp[neighbor] < mark:
+                        own_stamp[neighbor] = mark
+                        own_distance[neighbor] = own_distance[current] + 1
+                        own_parent[neighbor] = current
+                        next_layer.append(neighbor)
+                    if other_stamp[neighbor] == mark:
+                        total = own_distance[neighbor] + other_distance[neighbor]
+                        if best < 0 or total < best:
+                            best, meeting = total, neighbor
+            frontier[side][:] = next_layer
+
+        probe.lap("search")
+        if meeting < 0:
+            return probe.finish(AIMetrics("Bi-BFS", [], 0, sum(explored), 0, 0, 0, 0, explored[0], explored[1]), frontier_peak)
+
+        path = self._join_paths(parent[0], parent[1], meeting, cols)
+        path_length = self._calculate_path_length(path, maze)
+        probe.lap("reconstruction")
+        execution_time = time.perf_counter() - start_time
+
+        return probe.finish(AIMetrics(
+            algorithm_name="Bi-BFS",
+            path=path,
+            steps=len(path),
+            nodes_explored=sum(explored),
+            path_length=path_length,
+            execution_time=execution_time,
+            cpu_usage=0,
+            memory_usage=0,
+            nodes_explored_forward=explored[0],
+            nodes_explored_backward=explored[1],
+        ), frontier_peak)
+
+    # ------------------------------
+    # Bidirectional A* Search
+    # ------------------------------
+    def bidirectional_a_star(self, start_position, maze):
+        """
+        Perform A* from the start toward the goal and from the goal toward the start.
+
+        Both searches use the average potential p(v) = (h_goal(v) - h_start(v)) / 2
+        (negated for the backward side), which keeps the two searches consistent
+        with each other. Keys are kept doubled so they stay integers. Every time
+        an edge links cells seen by both searches, the best known path cost (mu)
+        is updated; the search stops once the two smallest keys add up to 2 * mu.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance whose flat grid is searched.
+        :return: AIMetrics with the optimal path from start to goal.
+        """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("Bi-A*", [], 0, 0, 0, 0, 0, 0))
+
+        if not self.validate_connectivity(maze, start_position):
+            return probe.finish(AIMetrics("Bi-A*", [], 0, 0, 0, 0, 0, 0))
+        probe.lap("connectivity")
+
+        # Metrics initialization
+        start_time = time.perf_counter()
+        track = probe.tracking  # Frontier size is only sampled while instrumentation is on
+        frontier_peak = 0
+        explored = [0, 0]  # Nodes expanded by the forward and backward search
+
+        offsets, targets = maze.adjacency()
+        cols = maze.cols
+        start_x, start_y = start_position
+        goal_x, goal_y = self.goal_position
+        start = start_y * cols + start_x
+        goal = goal_y * cols + goal_x
+
+        # Per direction: cells stamped mark have a g cost, mark + 1 are closed
+        workspace = self._workspace(maze)
+        mark = workspace.begin(sides=2)
+        closed = mark + 1
+        stamp, g_cost, parent = workspace.stamp, workspace.cost, workspace.parent
+        for side, root in ((0, start), (1, goal)):
+            stamp[side][root] = mark
+            g_cost[side][root] = 0
+            parent[side][root] = -1
+        distance = abs(start_x - goal_x) + abs(start_y - goal_y)
+        # Doubled key of a cell is 2g + sign * (h_goal - h_start); the sign flips for the backward side
+        open_sets = ([(distance, start)], [(distance, goal)])
+        best, meeting = (0, start) if start == goal else (-1, -1)
+
+        while True:
+            if track:
+                frontier_peak = max(frontier_peak, len(open_sets[0]) + len(open_sets[1]))
+            # Drop stale entries so the heap tops are the true minimum keys
+            for side in (0, 1):
+                heap = open_sets[side]
+                while heap and stamp[side][heap[0][1]] == closed:
+                    heapq.heappop(heap)
+            if not open_sets[0] or not open_sets[1]:
+                break
+            if best >= 0 and open_sets[0][0][0] + open_sets[1][0][0] >= 2 * best:
+                break
+
+            side = 0 if open_sets[0][0][0] <= open_sets[1][0][0] else 1
+            sign = 1 if side == 0 else -1
+            own_stamp, own_g, own_parent = stamp[side], g_cost[side], parent[side]
+            other_stamp, other_g = stamp[1 - side], g_cost[1 - side]
+            heap = open_sets[side]
+
+            _, current = heapq.heappop(heap)
+            own_stamp[current] = closed
+            explored[side] += 1
+
+            tentative_g_cost = own_g[current] + 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if own_stamp[neighbor] != closed and (own_stamp[neighbor] < mark or tentative_g_cost < own_g[neighbor]):
+                    own_stamp[neighbor] = mark
+                    own_g[neighbor] = tentative_g_cost
+                    own_parent[neighbor] = current
+                    ny, nx = divmod(neighbor, cols)
+                    potential = abs(nx - goal_x) + abs(ny - goal_y) - abs(nx - start_x) - abs(ny - start_y)
+                    heapq.heappush(heap, (2 * tentative_g_cost + sign * potential, neighbor))
+                if other_stamp[neighbor] >= mark and own_stamp[neighbor] >= mark:
+                    total = own_g[neighbor] + other_g[neighbor]
+                    if best < 0 or total < best:
+                        best, meeting = total, neighbor
+
+        probe.lap("search")
+        if meeting < 0:
+            return probe.finish(AIMetrics("Bi-A*", [], 0, sum(explored), 0, 0, 0, 0, explored[0], explored[1]), frontier_peak)
+
+        path = self._join_paths(parent[0], parent[1], meeting, cols)
+        path_length = self._calculate_path_length(path, maze)
+        probe.lap("reconstruction")
+        execution_time = time.perf_counter() - start_time
+
+        return probe.finish(AIMetrics(
+            algorithm_name="Bi-A*",
+            path=path,
+            steps=len(path),
+            nodes_explored=sum(explored),
+            path_length=path_length,
+            execution_time=execution_time,
+            cpu_usage=0,
+            memory_usage=0,
+            nodes_explored_forward=explored[0],
+            nodes_explored_backward=explored[1],
+        ), frontier_peak)
+
+
+    # ------------------------------
+    # Jump Point Search (JPS)
+    # ------------------------------
+    def jump_point_search(self, start_position, maze):
+        """
+        Perform A* over jump points of the 4-connected, unit-cost grid.
+
+        Instead of pushing every open neighbor, each expansion walks straight
+        in every direction until it hits a cell that offers a turn (an open
+        cell on either side of the direction of travel), the goal, or a dead
+        end. Only those jump points enter the open set. Every optimal path
+        turns only at such cells, so the result is as short as plain A*; it
+        is expanded back to one cell per step before being returned.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance whose flat grid is searched.
+        :return: AIMetrics with the optimal path from start to goal.
+        """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("JPS", [], 0, 0, 0, 0, 0, 0))
+
+        if not self.validate_connectivity(maze, start_position):
+            return probe.finish(AIMetrics("JPS", [], 0, 0, 0, 0, 0, 0))
+        probe.lap("connectivity")
+
+        # Metrics initialization
+        start_time = time.perf_counter()
+        track = probe.tracking  # Frontier size is only sampled while instrumentation is on
+        frontier_peak = 0
+        nodes_explored = 0
+
+        grid, cols = maze.grid, maze.cols
+        size = maze.rows * cols
+        start = start_position[1] * cols + start_position[0]
+        goal_x, goal_y = self.goal_position
+        goal = goal_y * cols + goal_x
+
+        open_set = [(self._heuristic(start_position), start)]  # Priority queue of (f cost, jump point)
+        workspace = self._workspace(maze)
+        mark = workspace.begin()             # Jump points stamped mark have a g cost, mark + 1 are closed
+        closed = mark + 1
+        stamp, g_cost, parent = workspace.stamp[0], workspace.cost[0], workspace.parent[0]
+        stamp[start] = mark
+        g_cost[start] = 0
+        parent[start] = -1                   # Previous jump point on the best known path
+
+        while open_set:
+            if track and len(open_set) > frontier_peak:
+                frontier_peak = len(open_set)
+            _, current = heapq.heappop(open_set)
+            if stamp[current] == closed:
+                continue  # Stale queue entry superseded by a cheaper one
+            stamp[current] = closed
+            nodes_explored += 1  # Count expanded jump points
+
+            if current == goal:
+                probe.lap("search")
+                path = self._expand_jump_path(parent, goal, cols)
+                path_length = self._calculate_path_length(path, maze)
+                probe.lap("reconstruction")
+                execution_time = time.perf_counter() - start_time
+
+                return probe.finish(AIMetrics(
+                    algorithm_name="JPS",
+                    path=path,
+                    steps=len(path),
+                    nodes_explored=nodes_explored,
+                    path_length=path_length,
+                    execution_time=execution_time,
+                    cpu_usage=0,
+                    memory_usage=0,
+                ), frontier_peak)
+
+            # No point walking straight back toward the jump point we came from
+            back_step = self._step_toward(current, parent[current], cols) if parent[current] >= 0 else 0
+            for step in (-1, 1, -cols, cols):
+                if step == back_step:
+                    continue
+                jump_point, distance = self._jump(current, step, goal, grid, cols, size)
+                if jump_point < 0 or stamp[jump_point] == closed:
+                    continue
+                tentative_g_cost = g_cost[current] + distance
+                if stamp[jump_point] < mark or tentative_g_cost < g_cost[jump_point]:
+                    stamp[jump_point] = mark
+                    g_cost[jump_point] = tentative_g_cost
+                    parent[jump_point] = current
+                    jy, jx = divmod(jump_point, cols)
+                    heapq.heappush(open_set, (tentative_g_cost + abs(jx - goal_x) + abs(jy - goal_y), jump_point))
+
+        probe.lap("search")
+        return probe.finish(AIMetrics("JPS", [], 0, nodes_explored, 0, 0, 0, 0), frontier_peak)
+
+    def _jump(self, current, step, goal, grid, cols, size):
+        """
+        Walk from a cell in one direction until the next jump point.
+
+        :param current: Flat index to walk from.
+        :param step: Index offset of the direction (-1, 1, -cols or cols).
+        :param goal: Flat index of the goal cell.
+        :param grid: Flat maze grid.
+        :param cols: Row stride of the grid.
+        :param size: Number of cells in the grid.
+        :return: Tuple (jump point index, distance walked), or (-1, 0) on a dead end.
+        """
+        horizontal = step in (1, -1)
+        # Side cells to check for a turn: above/below when moving horizontally, left/right otherwise
+        side = cols if horizontal else 1
+        x = current % cols
+        distance = 0
+        while True:
+            if horizontal:
+                x += step
+                if x < 0 or x >= cols:
+                    return -1, 0
+            current += step
+            if current < 0 or current >= size or grid[current]:
+                return -1, 0
+            distance += 1
+            if current == goal:
+                return current, distance
+            if horizontal:
+                turn = (current >= side and not grid[current - side]) or (
+                        current + side < size and not grid[current + side])
+            else:
+                x = current % cols
+                turn = (x > 0 and not grid[current - 1]) or (x < cols - 1 and not grid[current + 1])
+            if turn:
+                return current, distance
+
+    def _expand_jump_path(self, parent, goal, cols):
+        """
+        Turn a chain of jump points into a cell-by-cell path.
+
+        :param parent: Array mapping each jump point to the previous one (-1 for none).
+        :param goal: Flat index of the goal cell.
+        :param cols: Row stride of the grid.
+        :return: List of positions from start (exclusive) to goal.
+        """
+        path = []
+        current = goal
+        while parent[current] != -1:
+            previous = parent[current]
+            step = self._step_toward(current, previous, cols)
+            # Walk back from this jump point to the previous one, one cell at a time
+            while current != previous:
+                y, x = divmod(current, cols)
+                path.append((x, y))
+                current += step
+        path.reverse()
+        return path
+
+    def _step_toward(self, source, target, cols):
+        """Index offset of one step from source toward target on the same row or column."""
+        if source // cols == target // cols:
+            return 1 if target > source else -1
+        return cols if target > source else -cols
+
+
+    # ------------------------------
+    # Weighted Search (Dijkstra / A*)
+    # ------------------------------
+    def dijkstra(self, start_position, maze):
+        """
+        Perform Dijkstra's algorithm over the maze's terrain costs.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance whose grid and cost layer are searched.
+        :return: AIMetrics with the cheapest path; path_length is its total cost.
+        """
+        return self._bucket_search("Dijkstra", start_position, maze, use_heuristic=False)
+
+    def terrain_a_star(self, start_position, maze):
+        """
+        Perform A* over the maze's terrain costs.
+
+        Every step costs at least 1, so the Manhattan distance stays an
+        admissible and consistent heuristic. The heuristic is not inflated
+        (this is not weighted A*), so the path is the cheapest one, as with
+        dijkstra(), usually for fewer nodes.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance whose grid and cost layer are searched.
+        :return: AIMetrics with the cheapest path; path_length is its total cost.
+        """
+        return self._bucket_search("Terrain A*", start_position, maze, use_heuristic=True)
+
+    def _bucket_search(self, algorithm_name, start_position, maze, use_heuristic):
+        """
+        Shared Dijkstra/A* core using Dial's bucket queue instead of a binary heap.
+
+        Costs are small integers, so a key pushed while expanding key k is at
+        most k + max_cost + 1. A ring of max_cost + 2 buckets indexed by
+        key % len(buckets) therefore holds every pending key without
+        collisions, and push and pop are O(1) amortised.
+
+        :param algorithm_name: Name reported in AIMetrics.
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance whose grid and cost layer are searched.
+        :param use_heuristic: Add the Manhattan distance to the key (A*) or not (Dijkstra).
+        :return: AIMetrics of the search.
+        """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics(algorithm_name, [], 0, 0, 0, 0, 0, 0))
+
+        if not self.validate_connectivity(maze, start_position):
+            return probe.finish(AIMetrics(algorithm_name, [], 0, 0, 0, 0, 0, 0))
+        probe.lap("connectivity")
+
+        # Metrics initialization
+        start_time = time.perf_counter()
+        track = probe.tracking  # Frontier size is only sampled while instrumentation is on
+        frontier_peak = 0
+        nodes_explored = 0
+
+        offsets, targets = maze.adjacency()
+        costs, cols = maze.costs, maze.cols
+        start = start_position[1] * cols + start_position[0]
+        goal_x, goal_y = self.goal_position
+        goal = goal_y * cols + goal_x
+        weight = 1 if use_heuristic else 0
+
+        workspace = self._workspace(maze)
+        mark = workspace.begin()  # Cells stamped mark have a g cost, mark + 1 are closed
+        closed = mark + 1
+        stamp, g_cost, parent = workspace.stamp[0], workspace.cost[0], workspace.parent[0]
+        stamp[start] = mark
+        g_cost[start] = 0
+        parent[start] = -1
+
+        buckets = [[] for _ in range(maze.max_cost + 2)]
+        bucket_count = len(buckets)
+        key = weight * self._heuristic(start_position)
+        buckets[key % bucket_count].append(start)
+        pending = 1
+
+        while pending:
+            if track and pending > frontier_peak:
+                frontier_peak = pending
+            bucket = buckets[key % bucket_count]
+            while not bucket:
+                key += 1
+                bucket = buckets[key % bucket_count]
+            current = bucket.pop()
+            pending -= 1
+            if stamp[current] == closed:
+                continue  # Stale entry left behind by a cheaper push
+            stamp[current] = closed
+            nodes_explored += 1
+
+            if current == goal:
+                probe.lap("search")
+                path = self._reconstruct_path(parent, goal, cols)
+                probe.lap("reconstruction")
+                execution_time = time.perf_counter() - start_time
+
+                return probe.finish(AIMetrics(
+                    algorithm_name=algorithm_name,
+                    path=path,
+                    steps=len(path),
+                    nodes_explored=nodes_explored,
+                    path_length=g_cost[goal],
+                    execution_time=execution_time,
+                    cpu_usage=0,
+                    memory_usage=0,
+                ), frontier_peak)
+
+            current_g_cost = g_cost[current]
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if stamp[neighbor] == closed:
+                    continue
+                tentative_g_cost = current_g_cost + costs[neighbor]
+                if stamp[neighbor] < mark or tentative_g_cost < g_cost[neighbor]:
+                    stamp[neighbor] = mark
+                    g_cost[neighbor] = tentative_g_cost
+                    parent[neighbor] = current
+                    priority = tentative_g_cost
+                    if weight:
+                        ny, nx = divmod(neighbor, cols)
+                        priority += abs(nx - goal_x) + abs(ny - goal_y)
+                    buckets[priority % bucket_count].append(neighbor)
+                    pending += 1
+
+        probe.lap("search")
+        return probe.finish(AIMetrics(algorithm_name, [], 0, nodes_explored, 0, 0, 0, 0), frontier_peak)
+
+
+    # ------------------------------
+    # Goal Distance Field
+    # ------------------------------
+    def distance_field(self, maze):
+        """
+        Cost-to-goal of every cell, computed by one reverse search from the goal.
+
+        The field is cached against the maze version, so it is built once per
+        maze and reused by every hint until a cell or cost changes. It uses the
+        same bucket queue as the weighted solvers; without terrain that is
+        simply a BFS from the goal.
+
+        :param maze: Maze instance.
+        :return: array('i') of costs to the goal, -1 for walls and unreachable cells.
+        """
+        if self._distance_field is not None and self._distance_field[0] == maze.version:
+            return self._distance_field[1]
+
+        offsets, targets = maze.adjacency()
+        costs, cols = maze.costs, maze.cols
+        size = maze.rows * cols
+        goal = self.goal_position[1] * cols + self.goal_position[0]
+
+        distance = array("i", [-1]) * size
+        if maze.is_open(*self.goal_position):
+            closed = bytearray(size)
+            buckets = [[] for _ in range(maze.max_cost + 1)]
+            bucket_count = len(buckets)
+            distance[goal] = 0
+            buckets[0].append(goal)
+            key, pending = 0, 1
+            while pending:
+                bucket = buckets[key % bucket_count]
+                while not bucket:
+                    key += 1
+                    bucket = buckets[key % bucket_count]
+                current = bucket.pop()
+                pending -= 1
+                if closed[current]:
+                    continue
+                closed[current] = 1
+                # Stepping from a neighbor onto current costs current's terrain cost
+                tentative = distance[current] + costs[current]
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if not closed[neighbor] and (distance[neighbor] < 0 or tentative < distance[neighbor]):
+                        distance[neighbor] = tentative
+                        buckets[tentative % bucket_count].append(neighbor)
+                        pending += 1
+
+        self._distance_field = (maze.version, distance)
+        return distance
+
+    def hint(self, start_position, maze):
+        """
+        Read the cheapest path to the goal off the goal distance field.
+
+        After the field exists this costs O(path length): from each cell step
+        to the neighbor whose distance plus its own terrain cost equals the
+        current distance.
+
+        :param start_position: Tuple (x, y) to start from.
+        :param maze: Maze instance.
+        :return: AIMetrics with the cheapest path from start to goal.
+        """
+        probe = self.instrumentation
+        probe.begin()
+        start_time = time.perf_counter()
+        distance = self.distance_field(maze)
+        probe.lap("distance field")
+        offsets, targets = maze.adjacency()
+        costs, cols = maze.costs, maze.cols
+        current = start_position[1] * cols + start_position[0]
+        if not maze.is_open(*start_position) or distance[current] < 0:
+            return probe.finish(AIMetrics("Hint", [], 0, 0, 0, 0, 0, 0))
+
+        path = []
+        while distance[current] > 0:
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if distance[neighbor] >= 0 and distance[neighbor] + costs[neighbor] == distance[current]:
+                    current = neighbor
+                    break
+            y, x = divmod(current, cols)
+            path.append((x, y))
+        probe.lap("search")
+
+        return probe.finish(AIMetrics(
+            algorithm_name="Hint",
+            path=path,
+            steps=len(path),
+            nodes_explored=len(path),
+            path_length=distance[start_position[1] * cols + start_position[0]],
+            execution_time=time.perf_counter() - start_time,
+            cpu_usage=0,
+            memory_usage=0,
+        ))
+
+
+    # ------------------------------
+    # Incremental Replanning (D* Lite)
+    # ------------------------------
+    def d_star_lite(self, start_position, maze):
+        """
+        Plan with a D* Lite planner that survives between calls.
+
+        The first call on a maze does a full backward search. Later calls
+        after walls are toggled through Maze.apply_edits() only repair the
+        affected part of the search tree, and calls after the player moved
+        reuse the existing tree as is.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance.
+        :return: AIMetrics with the shortest path from start to goal.
+        """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("D* Lite", [], 0, 0, 0, 0, 0, 0))
+
+        if self._planner is None or self._planner.maze is not maze:
+            if self._planner is not None:
+                self._planner.detach()
+            self._planner = IncrementalPlanner(maze, self.goal_position)
+        metrics = self._planner.plan(tuple(start_position))
+        probe.lap("search")
+        return probe.finish(metrics)
+
+
+    # ------------------------------
+    # Hierarchical Path-Finding (HPA*)
+    # ------------------------------
+    def hierarchical_a_star(self, start_position, maze):
+        """
+        Plan on a cluster abstraction of the maze, then refine to cells.
+
+        The abstraction is built once per maze version; its build time is
+        reported as precompute_time and the cost of this query as query_time.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance.
+        :return: AIMetrics with a near-optimal path from start to goal.
+        """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("HPA*", [], 0, 0, 0, 0, 0, 0))
+
+        if not self.validate_connectivity(maze, start_position):
+            return probe.finish(AIMetrics("HPA*", [], 0, 0, 0, 0, 0, 0))
+        probe.lap("connectivity")
+
+        start_time = time.perf_counter()
+        if self._hierarchy is None or self._hierarchy.maze is not maze or self._hierarchy.version != maze.version:
+            self._hierarchy = HierarchicalPlanner(maze)
+            probe.lap("preprocessing")
+        metrics = self._hierarchy.find_path(tuple(start_position), self.goal_position)
+        probe.lap("search")
+        metrics.execution_time = time.perf_counter() - start_time
+        return probe.finish(metrics)
+
+
+    # ------------------------------
+    # Junction Graph Search
+    # ------------------------------
+    def junction_search(self, start_position, maze):
+        """
+        Search a pruned, corridor-contracted graph of the maze's junctions.
+
+        The graph is built once per maze version for this AI's goal; its build
+        time is reported as precompute_time and its size as reduction_ratio
+        (graph nodes per open cell).
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Maze instance.
+        :return: AIMetrics with the cheapest path from start to goal.
+        """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("Junction", [], 0, 0, 0, 0, 0, 0))
+
+        if not self.validate_connectivity(maze, start_position):
+            return probe.finish(AIMetrics("Junction", [], 0, 0, 0, 0, 0, 0))
+        probe.lap("connectivity")
+
+        start_time = time.perf_counter()
+        if self._junctions is None or self._junctions.maze is not maze or self._junctions.version != maze.version:
+            self._junctions = JunctionGraph(maze, self.goal_position)
+            probe.lap("preprocessing")
+        metrics = self._junctions.find_path(tuple(start_position))
+        probe.lap("search")
+        metrics.execution_time = time.perf_counter() - start_time
+        return probe.finish(metrics)
+
+
+    # ------------------------------
+    # Unbounded A*
+    # ------------------------------
+    def unbounded_a_star(self, start_position, maze, max_nodes=1_000_000):
+        """
+        A* that reads cells only through maze.is_open(x, y), for mazes without a flat grid.
+
+        Works on a ChunkedMaze, whose tiles are generated as the search reaches
+        them, as well as on a Maze. Search state lives in dicts keyed by (x, y),
+        so memory grows with the cells explored, not with the maze. An
+        unbounded maze has no component labels to rule out an unreachable goal
+        up front, so the search gives up after max_nodes expansions instead.
+        Every step costs 1, like a_star().
+
+        :param start_position: Tuple (x, y) to search from.
+        :param maze: Any maze with is_open(x, y), set_cell(x, y, value) and max_cost.
+        :param max_nodes: Expansions after which the search stops without a path.
+        :return: AIMetrics with the optimal path from start to goal, or no path if none was found in time.
+        """
+        probe = self.instrumentation
+        probe.begin()
+        if self._is_path_blocked(start_position, maze):
+            return probe.finish(AIMetrics("Unbounded A*", [], 0, 0, 0, 0, 0, 0))
+
+        # Metrics initialization
+        start_time = time.perf_counter()
+        track = probe.tracking  # Frontier size is only sampled while instrumentation is on
+        frontier_peak = 0
+        nodes_explored = 0
+
+        is_open = maze.is_open
+        start = tuple(start_position)
+        goal = goal_x, goal_y = tuple(self.goal_position)
+        open_set = [(self._heuristic(start), start)]  # Priority queue of (f cost, (x, y))
+        g_cost = {start: 0}
+        parent = {start: None}
+        closed = set()
+
+        while open_set:
+            if track and len(open_set) > frontier_peak:
+                frontier_peak = len(open_set)
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue  # Stale queue entry superseded by a cheaper one
+            closed.add(current)
+            nodes_explored += 1
+
+            if current == goal:
+                probe.lap("search")
+                path = []
+                while parent[current] is not None:
+                    path.append(current)
+                    current = parent[current]
+                path.reverse()
+                path_length = self._calculate_path_length(path, maze)
+                probe.lap("reconstruction")
+                return probe.finish(AIMetrics(
+                    algorithm_name="Unbounded A*",
+                    path=path,
+                    steps=len(path),
+                    nodes_explored=nodes_explored,
+                    path_length=path_length,
+                    execution_time=time.perf_counter() - start_time,
+                    cpu_usage=0,
+                    memory_usage=0,
+                ), frontier_peak)
+            if nodes_explored >= max_nodes:
+                break
+
+            x, y = current
+            tentative_g_cost = g_cost[current] + 1
+            for neighbor in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if neighbor not in closed and tentative_g_cost < g_cost.get(neighbor, tentative_g_cost + 1) \
+                        and is_open(*neighbor):
                     g_cost[neighbor] = tentative_g_cost
-                    f_cost[neighbor] = tentative_g_cost + self._heuristic(neighbor)
-                    heapq.heappush(open_set, (f_cost[neighbor], neighbor))
-                    parent_map[neighbor] = current_position  # Track how we reached this position
+                    parent[neighbor] = current
+                    f_cost = tentative_g_cost + abs(neighbor[0] - goal_x) + abs(neighbor[1] - goal_y)
+                    heapq.heappush(open_set, (f_cost, neighbor))
 
-        return AIMetrics("A*", [], 0, nodes_explored, 0, 0, 0, 0)
+        probe.lap("search")
+        return probe.finish(AIMetrics("Unbounded A*", [], 0, nodes_explored, 0, 0, 0, 0), frontier_peak)
 
 
     # ------------------------------
     # Utility Functions
     # ------------------------------
-    def _get_neighbors(self, position, maze, rows, cols):
+    def _workspace(self, maze):
         """
-        Get all valid neighbors (adjacent positions) for a given position.
-        
-        :param position: Current position (x, y).
-        :param maze: 2D list representing the maze.
-        :param rows: Number of rows in the maze.
-        :param cols: Number of columns in the maze.
-        :return: List of valid neighbors as (x, y) tuples.
-        """
-        x, y = position
-        neighbors = []
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < cols and 0 <= ny < rows and maze[ny][nx] == 0:
-                neighbors.append((nx, ny))
-        return neighbors
+        Return the shared search workspace, resized only if the maze dimensions changed.
+
+        :param maze: Maze instance about to be searched.
+        :return: SearchWorkspace with one slot per cell of the maze.
+        """
+        size = maze.rows * maze.cols
+        if self.workspace.size != size:
+            self.workspace.resize(size)
+        return self.workspace
 
     def _heuristic(self, position):
         """
         Calculate the Manhattan distance heuristic.
-        
+
         :param position: Current position (x, y).
         :return: Estimated cost (Manhattan distance) to reach the goal.
         """
         return abs(position[0] - self.goal_position[0]) + abs(position[1] - self.goal_position[1])
 
-    def _reconstruct_path(self, parent_map):
+    def _reconstruct_path(self, parent, goal, cols):
         """
-        Reconstruct the path from the parent map.
-        
-        :param parent_map: Dictionary mapping each position to its parent.
+        Reconstruct the path from the parent array.
+
+        Cells stay flat indices while searching; they are only converted
+        back to (x, y) tuples here, once the final path is known.
+
+        :param parent: Array mapping each cell index to its parent index (-1 for none).
+        :param goal: Flat index of the goal cell.
+        :param cols: Row stride of the grid.
         :return: List of positions representing the path from start to goal.
         """
         path = []
-        current_position = self.goal_position
-        while current_position in parent_map:
-            path.append(current_position)
-            current_position = parent_map[current_position]
+        current = goal
+        while parent[current] != -1:
+            y, x = divmod(current, cols)
+            path.append((x, y))
+            current = parent[current]
         path.reverse()
         return path
-    
+
+    def _join_paths(self, forward_parent, backward_parent, meeting, cols):
+        """
+        Merge the two parent chains of a bidirectional search into one path.
+
+        :param forward_parent: Parent array of the search rooted at the start.
+        :param backward_parent: Parent array of the search rooted at the goal.
+        :param meeting: Flat index of a cell reached by both searches.
+        :param cols: Row stride of the grid.
+        :return: List of positions from start (exclusive) to goal, like _reconstruct_path.
+        """
+        path = self._reconstruct_path(forward_parent, meeting, cols)
+        current = backward_parent[meeting]
+        while current != -1:
+            y, x = divmod(current, cols)
+            path.append((x, y))
+            current = backward_parent[current]
+        return path
+
     def _is_path_blocked(self, start_position, maze):
-        if maze[start_position[1]][start_position[0]] == 1:
+        if not maze.is_open(*start_position):
             print("Error: Starting position is blocked.")
             print(f"Blocked Start Position: {start_position}")
             return True
 
-        if maze[self.goal_position[1]][self.goal_position[0]] == 1:
+        if not maze.is_open(*self.goal_position):
             print("Error: Goal position is blocked. Forcing it open.")
             print(f"Blocked Goal Position: {self.goal_position}")
-            maze[self.goal_position[1]][self.goal_position[0]] = 0  # Force goal to be open
+            maze.set_cell(self.goal_position[0], self.goal_position[1], 0)  # Force goal to be open
             return False  # Treat as resolved
-        
+
         return False
 
-    def _calculate_path_length(self, path):
-        if not path:
-            return 0
-        return sum(abs(path[i][0] - path[i-1][0]) + abs(path[i][1] - path[i-1][1]) for i in range(1, len(path)))
-
-    def validate_connectivity(self, maze):
-        rows, cols = len(maze), len(maze[0])
-        queue = Queue()
-        queue.put(self.start_position)
-        visited = set()
-        visited.add(self.start_position)
-
-        while not queue.empty():
-            x, y = queue.get()
-            for neighbor in self._get_neighbors((x, y), maze, rows, cols):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.put(neighbor)
-
-        if self.goal_position not in visited:
+    def _calculate_path_length(self, path, maze):
+        """
+        Total traversal cost of a path: the terrain cost of every cell stepped onto.
+
+        On a maze without terrain every step costs 1, so this is the number of moves.
+
+        :param path: List of positions from start (exclusive) to goal.
+        :param maze: Maze instance providing the cost layer.
+        :return: Weighted length of the path.
+        """
+        if maze.max_cost == 1:
+            return len(path)  # Uniform floor: no need to touch (or allocate) the cost layer
+        costs, cols = maze.costs, maze.cols
+        return sum(costs[y * cols + x] for x, y in path)
+
+    def validate_connectivity(self, maze, start_position=None):
+        """
+        Check that the goal can be reached from a start position.
+
+        Uses the maze's cached component labels, so this is a constant-time
+        lookup once the labels exist for the current maze version.
+
+        :param maze: Maze instance.
+        :param start_position: Tuple (x, y); defaults to the AI's start position.
+        :return: True if start and goal are in the same open region.
+        """
+        if start_position is None:
+            start_position = self.start_position
+
+        if not maze.is_connected(start_position, self.goal_position):
             print("Error: Goal is unreachable from the start position.")
             return False
 
@@ -1,22 +1,219 @@
 class AIMetrics:
-    def __init__(self, algorithm_name, path, steps, nodes_explored, path_length, execution_time, cpu_usage, memory_usage):
+    __slots__ = ("algorithm_name", "steps", "nodes_explored", "path_length", "execution_time",
+                 "cpu_usage", "memory_usage", "nodes_explored_forward", "nodes_explored_backward",
+                 "precompute_time", "query_time", "reduction_ratio", "phases", "frontier_peak",
+                 "expansion_rate", "_origin", "_moves", "_path")
+
+    # One byte per step of a path: the direction from a cell to the next one
+    MOVES = {(-1, 0): ord("L"), (1, 0): ord("R"), (0, -1): ord("U"), (0, 1): ord("D")}
+    OFFSETS = {code: offset for offset, code in MOVES.items()}
+
+    # Columns of to_record(), in the order they are written to CSV
+    FIELDS = ("algorithm_name", "steps", "nodes_explored", "path_length", "execution_time",
+              "cpu_usage", "memory_usage", "nodes_explored_forward", "nodes_explored_backward",
+              "precompute_time", "query_time", "reduction_ratio", "phases", "frontier_peak",
+              "expansion_rate", "path_x", "path_y", "path_moves")
+
+    def __init__(self, algorithm_name, path, steps, nodes_explored, path_length, execution_time, cpu_usage, memory_usage,
+                 nodes_explored_forward=None, nodes_explored_backward=None,
+                 precompute_time=None, query_time=None, reduction_ratio=None,
+                 phases=None, frontier_peak=None, expansion_rate=None):
         self.algorithm_name = algorithm_name
         self.path = path
         self.steps = steps
         self.nodes_explored = nodes_explored
         self.path_length = path_length
         self.execution_time = execution_time
+        # Process CPU seconds and peak traced allocation in MB; 0 unless instrumentation was on
         self.cpu_usage = cpu_usage
         self.memory_usage = memory_usage
+        # Only set by bidirectional searches: how nodes_explored splits between the two frontiers
+        self.nodes_explored_forward = nodes_explored_forward
+        self.nodes_explored_backward = nodes_explored_backward
+        # Only set by solvers with a per-maze preprocessing step: its one-off cost vs. this query's cost
+        self.precompute_time = precompute_time
+        self.query_time = query_time
+        # Only set by graph-contracting solvers: graph nodes per open cell
+        self.reduction_ratio = reduction_ratio
+        # Only set when instrumentation was on: phase name -> (wall, CPU) seconds,
+        # largest frontier size and nodes expanded per second of the search phase
+        self.phases = phases
+        self.frontier_peak = frontier_peak
+        self.expansion_rate = expansion_rate
+
+    # ------------------------------
+    # Path encoding
+    # ------------------------------
+    @property
+    def path(self):
+        """
+        The path as a list of (x, y) tuples, decoded on first access and kept afterwards.
+
+        Internally the path is its first cell plus one direction byte
+        (L, R, U or D) per following step, about one byte per cell instead
+        of a tuple per cell.
+        """
+        if self._path is None:
+            path = []
+            if self._origin is not None:
+                x, y = self._origin
+                path.append((x, y))
+                offsets = self.OFFSETS
+                for move in self._moves:
+                    dx, dy = offsets[move]
+                    x += dx
+                    y += dy
+                    path.append((x, y))
+            self._path = path
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        """
+        Encode a path of (x, y) cells.
+
+        :param path: Sequence of cells, each one step left, right, up or down from the previous one.
+        :raises ValueError: If two consecutive cells are not neighbors.
+        """
+        self._path = None
+        if not path:
+            self._origin, self._moves = None, b""
+            return
+        codes = self.MOVES
+        moves = bytearray(len(path) - 1)
+        (x, y) = path[0]
+        self._origin = (x, y)
+        for i, (next_x, next_y) in enumerate(path[1:]):
+            code = codes.get((next_x - x, next_y - y))
+            if code is None:
+                raise ValueError(f"Path step from {(x, y)} to {(next_x, next_y)} is not a move to a neighbor")
+            moves[i] = code
+            x, y = next_x, next_y
+        self._moves = bytes(moves)
+
+    @property
+    def moves(self):
+        """Directions of the path after its first cell, as a string of L, R, U and D."""
+        return self._moves.decode("ascii")
+
+    def release_path(self):
+        """Drop the decoded path list; the next access to path decodes it again."""
+        self._path = None
+
+    # ------------------------------
+    # Export
+    # ------------------------------
+    def to_record(self):
+        """
+        Flat dict of the metrics with the path kept encoded, as written by write_jsonl/write_csv.
+
+        :return: Dict keyed by AIMetrics.FIELDS; path_x/path_y are the first cell (None if no path).
+        """
+        record = {name: getattr(self, name) for name in self.FIELDS[:-3]}
+        record["path_x"], record["path_y"] = self._origin if self._origin is not None else (None, None)
+        record["path_moves"] = self.moves
+        return record
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Rebuild AIMetrics from a record produced by to_record() (e.g. one line of a JSONL file).
+
+        :param record: Dict with the keys of AIMetrics.FIELDS.
+        :return: AIMetrics whose path stays encoded until it is accessed.
+        """
+        phases = record.get("phases")
+        metrics = cls(record["algorithm_name"], [], record["steps"], record["nodes_explored"], record["path_length"],
+                      record["execution_time"], record["cpu_usage"], record["memory_usage"],
+                      record.get("nodes_explored_forward"), record.get("nodes_explored_backward"),
+                      record.get("precompute_time"), record.get("query_time"), record.get("reduction_ratio"),
+                      {name: tuple(times) for name, times in phases.items()} if phases is not None else None,
+                      record.get("frontier_peak"), record.get("expansion_rate"))
+        if record.get("path_x") is not None:
+            metrics._origin = (record["path_x"], record["path_y"])
+            metrics._moves = record["path_moves"].encode("ascii")
+        return metrics
+
+    @staticmethod
+    def write_jsonl(metrics_list, file):
+        """
+        Stream metrics to a JSON Lines file, one record per line.
+
+        Each record is serialized and written on its own, so a generator of
+        results can be written without holding the whole batch in memory.
+
+        :param metrics_list: Iterable of AIMetrics.
+        :param file: Text file object opened for writing.
+        :return: Number of records written.
+        """
+        import json  # Export-only dependencies are imported on first use to keep the core import light
+        count = 0
+        for metrics in metrics_list:
+            file.write(json.dumps(metrics.to_record()))
+            file.write("\n")
+            count += 1
+        return count
+
+    @staticmethod
+    def read_jsonl(file):
+        """
+        Stream metrics back from a JSON Lines file written by write_jsonl().
+
+        :param file: Text file object opened for reading.
+        :return: Generator of AIMetrics.
+        """
+        import json
+        for line in file:
+            if line.strip():
+                yield AIMetrics.from_record(json.loads(line))
+
+    @staticmethod
+    def write_csv(metrics_list, file):
+        """
+        Stream metrics to a CSV file with a header row of AIMetrics.FIELDS.
+
+        Missing values are written as empty cells and phases as a JSON object.
+
+        :param metrics_list: Iterable of AIMetrics.
+        :param file: Text file object opened for writing with newline="".
+        :return: Number of rows written, not counting the header.
+        """
+        import csv
+        import json
+        writer = csv.DictWriter(file, fieldnames=AIMetrics.FIELDS)
+        writer.writeheader()
+        count = 0
+        for metrics in metrics_list:
+            record = metrics.to_record()
+            if record["phases"] is not None:
+                record["phases"] = json.dumps(record["phases"])
+            writer.writerow(record)
+            count += 1
+        return count
 
     def __str__(self):
-        """String representation for easy debugging and reporting."""
+        """String representation for easy debugging and reporting; the path is shown encoded."""
+        extra = ""
+        if self.nodes_explored_forward is not None:
+            extra = f"  Forward/Backward Nodes: {self.nodes_explored_forward}/{self.nodes_explored_backward}\n"
+        if self.precompute_time is not None:
+            extra += f"  Precompute/Query Time: {self.precompute_time:.4f}/{self.query_time:.4f} seconds\n"
+        if self.reduction_ratio is not None:
+            extra += f"  Reduction Ratio: {self.reduction_ratio:.4f}\n"
+        for phase, (wall, cpu) in (self.phases or {}).items():
+            extra += f"  Phase {phase}: {wall:.4f}s wall / {cpu:.4f}s CPU\n"
+        if self.frontier_peak is not None:
+            extra += f"  Frontier Peak: {self.frontier_peak}\n"
+        if self.expansion_rate is not None:
+            extra += f"  Expansion Rate: {self.expansion_rate:.0f} nodes/s\n"
+        moves = self.moves if len(self._moves) <= 60 else self.moves[:60] + "..."
         return (f"AIMetrics(\n"
                 f"  Algorithm: {self.algorithm_name}\n"
-                f"  Path: {self.path}\n"
+                f"  Path: {self._origin} {moves}\n"
                 f"  Steps: {self.steps}\n"
                 f"  Nodes Explored: {self.nodes_explored}\n"
+                f"{extra}"
                 f"  Path Length: {self.path_length}\n"
                 f"  Execution Time: {self.execution_time:.4f} seconds\n"
-                f"  CPU Usage: {self.cpu_usage:.2f}%\n"
-                f"  Memory Usage: {self.memory_usage:.2f} MB\n)")
+                f"  CPU Time: {self.cpu_usage:.4f} seconds\n"
+                f"  Peak Memory: {self.memory_usage:.2f} MB\n)")
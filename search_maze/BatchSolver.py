@@ -0,0 +1,197 @@
+import multiprocessing
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+from AI import AI
+from AIMetrics import AIMetrics
+from Instrumentation import Instrumentation
+from Maze import Maze
+from SearchWorkspace import SearchWorkspace
+
+
+class BatchSolver:
+    def __init__(self, maze, processes=None, chunksize=8, instrumentation_level=Instrumentation.OFF):
+        """
+        Run many (start, goal, algorithm) queries against one maze on a pool of processes.
+
+        The walls (and the terrain costs, if the maze has terrain) are copied
+        once into a shared memory block that every worker maps, so tasks only
+        carry their three query fields. Workers answer with the path still
+        encoded, so results cost about one byte per step to send back.
+
+        The batch sees the maze as it was when the BatchSolver was created or
+        last given to load(); edits made to the maze afterwards do not reach
+        the workers until it is loaded again. Loading only copies the grid:
+        the worker processes keep running and map the new snapshot when the
+        first query for it arrives. Queries whose goal is a wall get an empty
+        result instead of forcing the goal open, since the shared grid is
+        read-only.
+
+        Use it as a context manager, or call close(), to stop the workers and
+        free the shared memory.
+
+        Workers are started by a fork server (or spawned where there is none)
+        instead of being forked from the caller: a process forked after
+        pygame opened a window inherits SDL's SIGTERM handler, and then
+        close(cancel=True) can neither kill it nor return.
+
+        :param maze: Maze to solve on.
+        :param processes: Number of worker processes (default: one per CPU).
+        :param chunksize: Queries sent to a worker at a time; larger chunks cost less overhead on small mazes.
+        :param instrumentation_level: Instrumentation level of the workers' solvers.
+        """
+        self.chunksize = chunksize
+        self.instrumentation_level = instrumentation_level  # Sent with every query, so it can change between batches
+        self.memory = None
+        self.pool = _context().Pool(processes)  # Before the shared block, so a pool that fails to start leaks nothing
+        try:
+            self.load(maze)
+        except BaseException:
+            self.close(cancel=True)
+            raise
+
+    def load(self, maze):
+        """
+        Answer later queries on another maze, or on a newer version of the same one.
+
+        Queries already handed out must have finished: the previous snapshot
+        is released here.
+
+        :param maze: Maze to solve on.
+        """
+        self.rows, self.cols = maze.rows, maze.cols
+        self.version = maze.version  # Maze version the batch answers for
+        size = maze.rows * maze.cols
+        with_costs = maze.max_cost > 1
+        memory = shared_memory.SharedMemory(create=True, size=size * (2 if with_costs else 1))
+        memory.buf[:size] = maze.cells()
+        if with_costs:
+            memory.buf[size:2 * size] = maze.costs
+        self._release()
+        self.memory = memory
+        self.snapshot = (memory.name, maze.rows, maze.cols, maze.max_cost)  # What a worker needs to map the maze
+
+    def solve(self, queries):
+        """
+        Solve a batch of queries.
+
+        :param queries: Iterable of (start, goal, algorithm) with positions as (x, y) and algorithm a key of AI.ALGORITHMS.
+        :return: Iterator of AIMetrics in the order of the queries, yielded as soon as each one and all before it are done.
+        """
+        tasks = ((self.snapshot, self.instrumentation_level, query) for query in queries)
+        return self.pool.imap(_solve_query, tasks, self.chunksize)
+
+    def submit(self, query):
+        """
+        Start one query without waiting for it.
+
+        :param query: Tuple (start, goal, algorithm) as for solve().
+        :return: multiprocessing AsyncResult; ready() tells whether get() would block.
+        """
+        return self.pool.apply_async(_solve_query, ((self.snapshot, self.instrumentation_level, query),))
+
+    def workers(self):
+        """
+        Worker processes currently in the pool.
+
+        The pool starts a replacement when a worker dies but never gives up
+        on the queries the dead one held; a caller can notice the loss by a
+        process from this list getting an exitcode.
+
+        :return: List of multiprocessing Process objects.
+        """
+        return list(self.pool._pool)
+
+    def close(self, cancel=False):
+        """
+        Stop the workers and release the shared maze.
+
+        :param cancel: Kill queries still running instead of waiting for them.
+        """
+        if self.pool is None:
+            return
+        if cancel:
+            self.pool.terminate()
+        else:
+            self.pool.close()
+        self.pool.join()
+        self.pool = None
+        self._release()
+
+    def _release(self):
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _context():
+    """multiprocessing context whose workers start from a clean interpreter rather than a fork of the caller."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["BatchSolver"])  # Fork workers with the solvers already imported
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+# ------------------------------
+# Worker side
+# ------------------------------
+MAX_GOALS = 16  # Per-worker AIs kept, one per goal, so goal-specific preprocessing is reused across queries
+
+_memory = None  # SharedMemory block the worker's maze lives in
+_maze = None
+_solvers = OrderedDict()  # goal -> AI, least recently used first
+_workspace = SearchWorkspace()  # One SearchWorkspace shared by every AI of the worker, across snapshots
+_instrumentation_level = Instrumentation.OFF
+
+
+def _attach(name, rows, cols, max_cost):
+    """Map a shared maze snapshot into this worker, dropping the previous one."""
+    global _memory, _maze
+    _solvers.clear()
+    _maze = None
+    if _memory is not None:
+        try:
+            _memory.close()
+        except BufferError:
+            pass  # A view of the old grid is still referenced; the mapping goes away with it
+    _memory = shared_memory.SharedMemory(name=name)
+    size = rows * cols
+    _maze = Maze(rows, cols, 1, grid=_memory.buf[:size].toreadonly())
+    if max_cost > 1:
+        _maze.costs = _memory.buf[size:2 * size].toreadonly()
+        _maze.max_cost = max_cost
+
+
+def _solve_query(task):
+    """Answer one (snapshot, instrumentation level, (start, goal, algorithm)) task, mapping the snapshot if it is new."""
+    global _instrumentation_level
+    snapshot, instrumentation_level, (start, goal, algorithm) = task
+    if _memory is None or _memory.name != snapshot[0]:
+        _attach(*snapshot)
+    if instrumentation_level != _instrumentation_level:
+        _solvers.clear()  # Their cached results were measured at the old level
+        _instrumentation_level = instrumentation_level
+    start, goal = tuple(start), tuple(goal)
+    if not _maze.is_open(*goal):
+        return AIMetrics(algorithm, [], 0, 0, 0, 0, 0, 0)
+    ai = _solvers.get(goal)
+    if ai is None:
+        ai = AI(start, goal)
+        ai.workspace = _workspace
+        ai.instrumentation.level = _instrumentation_level
+        _solvers[goal] = ai
+        if len(_solvers) > MAX_GOALS:
+            _solvers.popitem(last=False)
+    else:
+        _solvers.move_to_end(goal)
+    metrics = ai.solve(algorithm, start, _maze)
+    metrics.release_path()  # Send the encoded path only
+    return metrics
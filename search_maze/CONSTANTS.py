@@ -1,5 +1,3 @@
-import pygame
-
 # A class of static constants
 class CONSTANTS:
     # Colors
@@ -26,7 +24,15 @@ class CONSTANTS:
     ROWS = MAZE_HEIGHT // CELL_SIZE
 
     @classmethod
-    def set_screen_size(cls, mazeSize=GRID_SIZE):
+    def set_screen_size(cls, mazeSize=GRID_SIZE, rows=None):
+        """
+        Size the maze grid to the display.
+
+        :param mazeSize: Number of columns.
+        :param rows: Number of rows, for a maze whose shape is fixed (e.g. loaded from a file);
+                     by default as many rows as fit the screen.
+        """
+        import pygame  # Only the game needs a display; the constants themselves must not pull in pygame
         cls.SCREEN_WIDTH, cls.SCREEN_HEIGHT = pygame.display.Info().current_w, pygame.display.Info().current_h
         cls.GRID_SIZE = mazeSize
         cls.RIGHT_COLUMN_WIDTH = 300  # Fixed width for the right-side column
@@ -37,6 +43,14 @@ class CONSTANTS:
         cls.COLS = cls.GRID_SIZE  # Use GRID_SIZE directly for columns
         cls.CELL_SIZE = cls.MAZE_WIDTH // cls.COLS  # Dynamically calculate cell size
         cls.ROWS = cls.MAZE_HEIGHT // cls.CELL_SIZE  # Adjust rows to fit the height dynamically
+        if rows is not None:
+            cls.ROWS = rows
+            cls.CELL_SIZE = min(cls.MAZE_WIDTH // cls.COLS, cls.MAZE_HEIGHT // rows)  # Both sides on screen
+
+    @classmethod
+    def fits_screen(cls, rows, cols):
+        """Whether a maze of rows x cols cells can be shown with cells of at least one pixel."""
+        return cols <= cls.MAZE_WIDTH and rows <= cls.MAZE_HEIGHT
 
 
     # Player
@@ -47,6 +61,21 @@ class CONSTANTS:
     AI_COLOR = YELLOW
     AI_RADIUS = CELL_SIZE // 2
 
+    # Animated searches: expanded cells and the cells waiting in the frontier
+    VISITED_COLOR = (173, 216, 230)
+    FRONTIER_COLOR = (255, 165, 0)
+
+    # Terrain: floor color by traversal cost (index = cost, higher costs use the last entry)
+    TERRAIN_COLORS = (
+        BLACK,            # unused, cost 0
+        WHITE,            # 1: floor
+        (222, 206, 170),  # 2: sand
+        (186, 154, 108),  # 3: mud
+        (139, 105, 70),   # 4: deep mud
+        (120, 170, 230),  # 5: shallow water
+        (70, 120, 200),   # 6+: deep water
+    )
+
     # Button
     BUTTON_COLOR = (70, 130, 180)
     BUTTON_HOVER_COLOR = (100, 149, 237)
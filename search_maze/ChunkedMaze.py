@@ -0,0 +1,168 @@
+import random
+from collections import OrderedDict
+from itertools import count
+
+from Maze import Maze
+
+
+# Own counter, separate from Maze's, so versions of chunked mazes are unique among themselves
+_versions = count(1)
+
+
+class ChunkedMaze:
+    # Generators that leave every cell of a tile open and connected, which the doors between tiles rely on;
+    # the backtracker's dead ends can wall off the cell behind a door
+    TILE_GENERATORS = ("eller",)
+
+    def __init__(self, cell_size, seed=0, tile_size=64, max_tiles=256, generator="eller"):
+        """
+        Maze without bounds, built from square tiles generated on first use.
+
+        Tile (tx, ty) covers cells tx * tile_size <= x < (tx + 1) * tile_size
+        and likewise for y, at any integer tx and ty including negative ones.
+        Its walls are a Maze of tile_size + 1 cells a side, generated from
+        (seed, tx, ty) alone, so a tile comes out the same whenever it is
+        rebuilt. Each tile owns its top row and left column, the walls it
+        shares with the tiles above and to the left, and opens doors in them
+        at positions drawn from the same seed; every tile is connected inside
+        and every border has a door, so the whole world is one region.
+
+        Only the max_tiles most recently used tiles are kept; older ones are
+        dropped and regenerated if they are needed again. Wall edits are kept
+        apart from the tiles and replayed onto them, so they survive eviction.
+
+        Everything reads cells through is_open(x, y): the player, and AI's
+        unbounded_a_star() which searches without a flat grid.
+
+        :param cell_size: Size of one cell in pixels.
+        :param seed: Seed of the world; the same seed gives the same maze everywhere.
+        :param tile_size: Cells per tile side; must be even so that cells sit at odd coordinates in every tile.
+        :param max_tiles: Number of tiles kept in memory (tile_size ** 2 bytes each).
+        :param generator: Key of Maze.GENERATORS used inside each tile; one of TILE_GENERATORS.
+        :raises ValueError: If tile_size is odd or smaller than 4, max_tiles is below 1 or the generator is not a tile generator.
+        """
+        if tile_size % 2 or tile_size < 4:
+            raise ValueError("tile_size must be an even number of at least 4")
+        if max_tiles < 1:
+            raise ValueError("max_tiles must be at least 1")
+        if generator not in self.TILE_GENERATORS:
+            raise ValueError(f"Tiles cannot be built with {generator!r}; choose one of {', '.join(self.TILE_GENERATORS)}")
+        self.cell_size = cell_size
+        self.seed = seed
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.generator = generator
+        self.max_cost = 1  # No terrain: every step costs 1
+        self.tiles = OrderedDict()  # (tx, ty) -> bytearray of tile_size ** 2 cells, least recently used first
+        self.tiles_generated = 0
+        self.edits = {}  # (x, y) -> value of every cell changed with set_cell(), replayed onto regenerated tiles
+        self.listeners = []  # Callables notified with the changed (x, y) cells after every edit
+        self.version = next(_versions)
+        self._last_key = None  # Most recently used tile, checked first since lookups cluster
+        self._last_tile = None
+
+    # ------------------------------
+    # Tiles
+    # ------------------------------
+    def tile(self, tx, ty):
+        """
+        Walls of one tile, generating it if it is not in memory.
+
+        :param tx: Tile column.
+        :param ty: Tile row.
+        :return: bytearray with cell (lx, ly) of the tile at ly * tile_size + lx (0 = open, 1 = wall).
+        """
+        key = (tx, ty)
+        if key == self._last_key:
+            return self._last_tile
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self._generate_tile(tx, ty)
+            self.tiles[key] = tile
+            while len(self.tiles) > self.max_tiles:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end(key)
+        self._last_key, self._last_tile = key, tile
+        return tile
+
+    def _generate_tile(self, tx, ty):
+        size = self.tile_size
+        # Inner walls from an ordinary maze; its bottom row and right column belong to the neighbors
+        inner = Maze(size + 1, size + 1, self.cell_size, seed=f"{self.seed}:{tx}:{ty}", generator=self.generator).grid
+        tile = bytearray(size * size)
+        for ly in range(size):
+            tile[ly * size:(ly + 1) * size] = inner[ly * (size + 1):ly * (size + 1) + size]
+
+        # Doors to the tile on the left and the one above, at cell rows/columns (odd local coordinates)
+        rnd = random.Random(f"{self.seed}:{tx}:{ty}:doors")
+        doors = max(1, size // 16)
+        for ly in rnd.sample(range(1, size, 2), doors):
+            tile[ly * size] = 0
+        for lx in rnd.sample(range(1, size, 2), doors):
+            tile[lx] = 0
+
+        self.tiles_generated += 1
+        if self.edits:
+            x0, y0 = tx * size, ty * size
+            for (x, y), value in self.edits.items():
+                if x0 <= x < x0 + size and y0 <= y < y0 + size:
+                    tile[(y - y0) * size + x - x0] = value
+        return tile
+
+    # ------------------------------
+    # Cells
+    # ------------------------------
+    def is_open(self, x, y):
+        size = self.tile_size
+        tx, lx = divmod(x, size)
+        ty, ly = divmod(y, size)
+        return not self.tile(tx, ty)[ly * size + lx]
+
+    def set_cell(self, x, y, value):
+        """
+        Change a single cell and bump the version if it actually changed.
+
+        :param x: Column of the cell.
+        :param y: Row of the cell.
+        :param value: 0 for open, 1 for wall.
+        """
+        self.apply_edits([(x, y, value)])
+
+    def toggle_wall(self, x, y):
+        """Turn a wall into floor or floor into a wall."""
+        self.apply_edits([(x, y, 1 if self.is_open(x, y) else 0)])
+
+    def apply_edits(self, edits):
+        """
+        Apply a batch of wall edits, bump the version once and notify listeners.
+
+        :param edits: Iterable of (x, y, value) with value 0 for open, 1 for wall.
+        :return: List of (x, y) cells that actually changed.
+        """
+        size = self.tile_size
+        changed = []
+        for x, y, value in edits:
+            tx, lx = divmod(x, size)
+            ty, ly = divmod(y, size)
+            tile = self.tile(tx, ty)
+            if tile[ly * size + lx] != value:
+                tile[ly * size + lx] = value
+                self.edits[(x, y)] = value
+                changed.append((x, y))
+        if changed:
+            self.version = next(_versions)
+            for listener in self.listeners:
+                listener(changed)
+        return changed
+
+    def add_listener(self, listener):
+        """
+        Register a callable to be told about cell changes.
+
+        :param listener: Callable taking a list of changed (x, y) cells.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
@@ -0,0 +1,36 @@
+class FrameBudget:
+    def __init__(self, fps=60, share=0.8, min_slice=0.001, smoothing=0.2):
+        """
+        Time a search may take per frame, adapted to how long the rest of the frame takes.
+
+        After every frame the game reports the frame's total time and the part
+        of it spent searching. The rest (drawing, input) is averaged, and the
+        next slice is what is left of share of the frame period after it, so
+        frames stay within the target rate whether the maze is cheap or
+        expensive to draw. A slower machine or a bigger maze gets smaller
+        slices, never less than min_slice so the search still progresses.
+
+        :param fps: Target frame rate.
+        :param share: Fraction of the frame period that drawing plus searching may fill.
+        :param min_slice: Smallest slice in seconds.
+        :param smoothing: Weight of the newest frame in the running average (0-1).
+        """
+        self.frame_period = 1 / fps
+        self.share = share
+        self.min_slice = min_slice
+        self.smoothing = smoothing
+        self.other_time = 0.0  # Running average of per-frame time spent outside the search
+        self.slice = min_slice
+
+    def update(self, frame_time, search_time):
+        """
+        Record a finished frame and work out the next slice.
+
+        :param frame_time: Seconds the whole frame took to compute, without waiting for the next tick.
+        :param search_time: Seconds of it spent stepping the search.
+        :return: The new slice in seconds.
+        """
+        other = max(0.0, frame_time - search_time)
+        self.other_time += self.smoothing * (other - self.other_time)
+        self.slice = max(self.min_slice, self.frame_period * self.share - self.other_time)
+        return self.slice
@@ -0,0 +1,214 @@
+import heapq
+import time
+
+from AIMetrics import AIMetrics
+
+
+class HierarchicalPlanner:
+    def __init__(self, maze, cluster_size=16):
+        """
+        Hierarchical path-finding (HPA*) abstraction of a maze.
+
+        The grid is split into cluster_size x cluster_size clusters. Wherever
+        two neighboring clusters share a run of open cell pairs across their
+        border, one entrance (or two, at both ends of a long run) becomes a
+        pair of abstract nodes. Inside every cluster the cost between each pair
+        of its entrances is computed once, here, so a query only searches the
+        small abstract graph and then refines the clusters on the chosen route.
+
+        Paths are near-optimal: they are restricted to the chosen entrances.
+
+        :param maze: Maze instance to abstract; rebuild when its version changes.
+        :param cluster_size: Side length of a cluster in cells.
+        """
+        start_time = time.perf_counter()
+        self.maze = maze
+        self.version = maze.version
+        self.cluster_size = cluster_size
+        self.cols = maze.cols
+        self.cluster_cols = -(-maze.cols // cluster_size)
+        self.edges = {}      # Abstract node (cell index) -> list of (neighbor node, cost)
+        self.entrances = {}  # Cluster id -> list of abstract nodes inside it
+
+        self._find_entrances()
+        for cluster, nodes in self.entrances.items():
+            for node in nodes:
+                distance, _ = self._cluster_search(node, cluster)
+                for other in nodes:
+                    if other != node and other in distance:
+                        self.edges[node].append((other, distance[other]))
+        self.precompute_time = time.perf_counter() - start_time
+
+    def find_path(self, start_position, goal_position):
+        """
+        Search the abstract graph between two cells and refine it to a cell path.
+
+        :param start_position: Tuple (x, y) to search from.
+        :param goal_position: Tuple (x, y) to reach.
+        :return: AIMetrics; query_time excludes the one-off precompute.
+        """
+        start_time = time.perf_counter()
+        cols = self.cols
+        start = start_position[1] * cols + start_position[0]
+        goal = goal_position[1] * cols + goal_position[0]
+        start_cluster, goal_cluster = self._cluster_of(start), self._cluster_of(goal)
+        nodes_explored = 0
+
+        # Temporary edges linking start and goal to the entrances of their clusters
+        extra_edges = {start: []}
+        start_distance, _ = self._cluster_search(start, start_cluster)
+        nodes_explored += len(start_distance)
+        for node in self.entrances.get(start_cluster, []):
+            if node in start_distance:
+                extra_edges[start].append((node, start_distance[node]))
+        if goal in start_distance:
+            extra_edges[start].append((goal, start_distance[goal]))
+
+        goal_distance, _ = self._cluster_search(goal, goal_cluster)
+        nodes_explored += len(goal_distance)
+        costs = self.maze.costs
+        for node in self.entrances.get(goal_cluster, []):
+            if node in goal_distance:
+                # Reverse the goal-rooted distance: leave node's cost out, add the goal's
+                extra_edges.setdefault(node, []).append((goal, goal_distance[node] - costs[node] + costs[goal]))
+
+        abstract_path, expanded = self._abstract_search(start, goal, extra_edges)
+        nodes_explored += expanded
+
+        path = []
+        for previous, current in zip(abstract_path, abstract_path[1:]):
+            cluster = self._cluster_of(current)
+            if self._cluster_of(previous) != cluster:
+                y, x = divmod(current, cols)  # Inter-cluster edge between adjacent cells
+                path.append((x, y))
+                continue
+            distance, parent = self._cluster_search(previous, cluster, target=current)
+            nodes_explored += len(distance)
+            segment = []
+            cell = current
+            while cell != previous:
+                y, x = divmod(cell, cols)
+                segment.append((x, y))
+                cell = parent[cell]
+            path.extend(reversed(segment))
+
+        query_time = time.perf_counter() - start_time
+        return AIMetrics(
+            algorithm_name="HPA*",
+            path=path,
+            steps=len(path),
+            nodes_explored=nodes_explored,
+            path_length=sum(costs[y * cols + x] for x, y in path),
+            execution_time=query_time,
+            cpu_usage=0,
+            memory_usage=0,
+            precompute_time=self.precompute_time,
+            query_time=query_time,
+        )
+
+    # ------------------------------
+    # Abstraction building
+    # ------------------------------
+    def _find_entrances(self):
+        grid, cols, rows = self.maze.grid, self.maze.cols, self.maze.rows
+        size = self.cluster_size
+        # Vertical borders: cell (x - 1, y) in one cluster, (x, y) in the next
+        for x in range(size, cols, size):
+            for y0 in range(0, rows, size):
+                self._add_entrances([(y * cols + x - 1, y * cols + x) for y in range(y0, min(y0 + size, rows))], grid)
+        # Horizontal borders: cell (x, y - 1) above, (x, y) below
+        for y in range(size, rows, size):
+            for x0 in range(0, cols, size):
+                self._add_entrances([((y - 1) * cols + x, y * cols + x) for x in range(x0, min(x0 + size, cols))], grid)
+
+    def _add_entrances(self, pairs, grid):
+        """Turn every run of open cell pairs along one border into entrances."""
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and not grid[a] and not grid[b]:
+                run.append((a, b))
+                continue
+            if run:
+                chosen = [run[0], run[-1]] if len(run) >= 6 else [run[len(run) // 2]]
+                costs = self.maze.costs
+                for a_cell, b_cell in chosen:
+                    for node in (a_cell, b_cell):
+                        if node not in self.edges:
+                            self.edges[node] = []
+                            self.entrances.setdefault(self._cluster_of(node), []).append(node)
+                    self.edges[a_cell].append((b_cell, costs[b_cell]))
+                    self.edges[b_cell].append((a_cell, costs[a_cell]))
+                run = []
+
+    # ------------------------------
+    # Searches
+    # ------------------------------
+    def _abstract_search(self, start, goal, extra_edges):
+        """A* over abstract nodes; returns (node path from start to goal, nodes expanded)."""
+        cols = self.cols
+        goal_y, goal_x = divmod(goal, cols)
+        g_cost = {start: 0}
+        parent = {start: None}
+        closed = set()
+        open_set = [(0, start)]
+        expanded = 0
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parent[current]
+                path.reverse()
+                return path, expanded
+            for neighbor, cost in self.edges.get(current, []) + extra_edges.get(current, []):
+                tentative_g_cost = g_cost[current] + cost
+                if neighbor not in closed and tentative_g_cost < g_cost.get(neighbor, tentative_g_cost + 1):
+                    g_cost[neighbor] = tentative_g_cost
+                    parent[neighbor] = current
+                    ny, nx = divmod(neighbor, cols)
+                    heapq.heappush(open_set, (tentative_g_cost + abs(nx - goal_x) + abs(ny - goal_y), neighbor))
+        return [], expanded
+
+    def _cluster_search(self, source, cluster, target=None):
+        """
+        Dijkstra from source that never leaves its cluster.
+
+        :return: (cost dict, parent dict) of the cells reached; stops early at target if given.
+        """
+        grid, costs, cols = self.maze.grid, self.maze.costs, self.cols
+        x0, y0, x1, y1 = self._cluster_bounds(cluster)
+        distance = {source: 0}
+        parent = {}
+        open_set = [(0, source)]
+        while open_set:
+            cost, current = heapq.heappop(open_set)
+            if cost > distance[current]:
+                continue
+            if current == target:
+                break
+            y, x = divmod(current, cols)
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if x0 <= nx < x1 and y0 <= ny < y1:
+                    neighbor = ny * cols + nx
+                    if not grid[neighbor]:
+                        tentative = cost + costs[neighbor]
+                        if tentative < distance.get(neighbor, tentative + 1):
+                            distance[neighbor] = tentative
+                            parent[neighbor] = current
+                            heapq.heappush(open_set, (tentative, neighbor))
+        return distance, parent
+
+    def _cluster_of(self, index):
+        y, x = divmod(index, self.cols)
+        return (y // self.cluster_size) * self.cluster_cols + x // self.cluster_size
+
+    def _cluster_bounds(self, cluster):
+        cy, cx = divmod(cluster, self.cluster_cols)
+        size = self.cluster_size
+        return (cx * size, cy * size,
+                min((cx + 1) * size, self.maze.cols), min((cy + 1) * size, self.maze.rows))
@@ -0,0 +1,193 @@
+from array import array
+import heapq
+import time
+
+from AIMetrics import AIMetrics
+
+
+# Stand-in for an infinite cost that still fits in array("i")
+INF = 1 << 30
+
+
+class IncrementalPlanner:
+    def __init__(self, maze, goal_position):
+        """
+        D* Lite planner that keeps its search state between queries.
+
+        The planner searches backward from the goal, so g/rhs hold the cost to
+        the goal and stay valid while the player moves. It registers itself as
+        a maze listener; cells changed through Maze.apply_edits(), set_cell()
+        or set_cost() are queued and repaired on the next plan() call, which
+        only re-expands the part of the search tree the edits affect.
+
+        :param maze: Maze instance to plan on.
+        :param goal_position: Tuple (x, y) of the goal.
+        """
+        self.maze = maze
+        self.goal_position = goal_position
+        self.cols = maze.cols
+        self.size = maze.rows * maze.cols
+        self.goal = goal_position[1] * self.cols + goal_position[0]
+
+        self.g = array("i", [INF]) * self.size
+        self.rhs = array("i", [INF]) * self.size
+        self.open_set = []  # Heap of ((k1, k2), cell index), stale entries skipped lazily
+        self.km = 0         # Key modifier accumulated as the start moves
+        self.last_start = None
+        self.pending = []   # Changed cells not yet repaired
+        self.expansions = 0
+
+        self.rhs[self.goal] = 0
+        heapq.heappush(self.open_set, ((self._heuristic(self.goal, self.goal), 0), self.goal))
+        maze.add_listener(self.cells_changed)
+
+    def cells_changed(self, cells):
+        """Maze listener: remember edited cells until the next plan()."""
+        self.pending.extend(cells)
+
+    def detach(self):
+        """Stop listening to the maze."""
+        self.maze.remove_listener(self.cells_changed)
+
+    def update(self, cells):
+        """
+        Repair the search state around changed cells.
+
+        Every edge touching an edited cell may have changed cost, so the cell
+        and its four neighbors get their rhs recomputed.
+
+        :param cells: List of (x, y) cells whose wall or cost changed.
+        """
+        cols = self.cols
+        for x, y in cells:
+            index = y * cols + x
+            self._update_vertex(index)
+            for neighbor in self._neighbors(index):
+                self._update_vertex(neighbor)
+
+    def plan(self, start_position):
+        """
+        Return the current shortest path from start_position to the goal.
+
+        :param start_position: Tuple (x, y) of the player.
+        :return: AIMetrics; nodes_explored counts expansions done by this call only.
+        """
+        start_time = time.perf_counter()
+        start = start_position[1] * self.cols + start_position[0]
+        self.expansions = 0
+
+        if self.last_start is not None and self.last_start != start:
+            self.km += self._heuristic(self.last_start, start)
+        self.last_start = start
+
+        if self.pending:
+            cells, self.pending = self.pending, []
+            self.update(cells)
+
+        self._compute_shortest_path(start)
+        path = self._extract_path(start)
+        execution_time = time.perf_counter() - start_time
+        path_length = self.g[start] if path or start == self.goal else 0
+
+        return AIMetrics(
+            algorithm_name="D* Lite",
+            path=path,
+            steps=len(path),
+            nodes_explored=self.expansions,
+            path_length=path_length,
+            execution_time=execution_time,
+            cpu_usage=0,
+            memory_usage=0,
+        )
+
+    # ------------------------------
+    # D* Lite internals
+    # ------------------------------
+    def _compute_shortest_path(self, start):
+        g, rhs, open_set = self.g, self.rhs, self.open_set
+        while open_set:
+            key, current = open_set[0]
+            if g[current] == rhs[current]:
+                heapq.heappop(open_set)  # Already consistent, stale entry
+                continue
+            current_key = self._key(current, start)
+            if key != current_key:
+                heapq.heappop(open_set)
+                if key < current_key:
+                    heapq.heappush(open_set, (current_key, current))
+                continue
+            if key >= self._key(start, start) and rhs[start] == g[start]:
+                break
+
+            heapq.heappop(open_set)
+            self.expansions += 1
+            if g[current] > rhs[current]:
+                g[current] = rhs[current]
+                for neighbor in self._neighbors(current):
+                    self._update_vertex(neighbor)
+            else:
+                g[current] = INF
+                self._update_vertex(current)
+                for neighbor in self._neighbors(current):
+                    self._update_vertex(neighbor)
+
+    def _update_vertex(self, index):
+        grid, costs, g = self.maze.grid, self.maze.costs, self.g
+        if index != self.goal:
+            best = INF
+            if not grid[index]:
+                for neighbor in self._neighbors(index):
+                    if not grid[neighbor] and g[neighbor] < INF:
+                        best = min(best, g[neighbor] + costs[neighbor])
+            self.rhs[index] = best
+        if g[index] != self.rhs[index]:
+            heapq.heappush(self.open_set, (self._key(index, self.last_start), index))
+
+    def _key(self, index, start):
+        best = min(self.g[index], self.rhs[index])
+        if best >= INF:
+            return (INF, INF)
+        # Before the first plan() there is no start yet; the key is fixed lazily once there is
+        heuristic = self._heuristic(start, index) if start is not None else 0
+        return (best + heuristic + self.km, best)
+
+    def _extract_path(self, start):
+        grid, costs, g = self.maze.grid, self.maze.costs, self.g
+        cols = self.cols
+        if g[start] >= INF or grid[start]:
+            return []
+        path = []
+        current = start
+        # Follow the cheapest successor; bounded in case of inconsistent state
+        for _ in range(self.size):
+            if current == self.goal:
+                return path
+            best, best_cost = -1, INF
+            for neighbor in self._neighbors(current):
+                if not grid[neighbor] and g[neighbor] < INF and g[neighbor] + costs[neighbor] < best_cost:
+                    best, best_cost = neighbor, g[neighbor] + costs[neighbor]
+            if best < 0:
+                return []
+            current = best
+            y, x = divmod(current, cols)
+            path.append((x, y))
+        return []
+
+    def _neighbors(self, index):
+        cols, size = self.cols, self.size
+        x = index % cols
+        neighbors = []
+        if x > 0:
+            neighbors.append(index - 1)
+        if x < cols - 1:
+            neighbors.append(index + 1)
+        if index >= cols:
+            neighbors.append(index - cols)
+        if index + cols < size:
+            neighbors.append(index + cols)
+        return neighbors
+
+    def _heuristic(self, a, b):
+        ay, ax = divmod(a, self.cols)
+        by, bx = divmod(b, self.cols)
+        return abs(ax - bx) + abs(ay - by)
@@ -0,0 +1,83 @@
+import time
+
+
+class Instrumentation:
+    OFF = 0     # Only execution_time is measured
+    TIMING = 1  # Per-phase wall/CPU time, frontier high-water mark and expansion rate
+    MEMORY = 2  # TIMING plus peak Python allocation via tracemalloc; tracing slows searches many times over
+    LEVEL_NAMES = ("Off", "Timing", "Memory")
+
+    def __init__(self, level=OFF):
+        """
+        Measurements taken around one solver query at a time.
+
+        A solver calls begin() before its checks, lap(phase) at the end of
+        each phase and finish(metrics) on every return; finish() copies the
+        collected numbers into the AIMetrics. At the OFF level every call
+        returns straight away, and solvers only sample their frontier size
+        while tracking is True, so the search loops run as before.
+
+        :param level: One of OFF, TIMING or MEMORY.
+        """
+        self.level = level
+        self.tracking = False
+        self.phases = {}  # Phase name -> (wall seconds, CPU seconds) of the current query
+        self._started_tracing = False
+        self._wall_start = self._cpu_start = 0.0
+        self._wall_mark = self._cpu_mark = 0.0
+
+    def begin(self):
+        """Start measuring a query."""
+        self.tracking = self.level > self.OFF
+        if not self.tracking:
+            return
+        self.phases = {}
+        if self.level >= self.MEMORY:
+            import tracemalloc  # Imported on first use: it pulls in pickle and is only needed at this level
+            # Leave tracing alone if someone else already turned it on; just reset the peak
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+        self._wall_start = self._wall_mark = time.perf_counter()
+        self._cpu_start = self._cpu_mark = time.process_time()
+
+    def lap(self, phase):
+        """
+        Close the current phase and start the next one.
+
+        :param phase: Name the time since the previous lap is recorded under.
+        """
+        if not self.tracking:
+            return
+        wall, cpu = time.perf_counter(), time.process_time()
+        self.phases[phase] = (wall - self._wall_mark, cpu - self._cpu_mark)
+        self._wall_mark, self._cpu_mark = wall, cpu
+
+    def finish(self, metrics, frontier_peak=None):
+        """
+        Stop measuring and report the query's numbers through its AIMetrics.
+
+        Fills cpu_usage (process CPU seconds), memory_usage (peak traced MB,
+        MEMORY level only), phases, frontier_peak and expansion_rate (nodes
+        expanded per second of the search phase).
+
+        :param metrics: AIMetrics about to be returned by the solver.
+        :param frontier_peak: Largest open set or queue size seen, if the solver sampled it.
+        :return: The same AIMetrics.
+        """
+        if not self.tracking:
+            return metrics
+        self.tracking = False
+        metrics.cpu_usage = time.process_time() - self._cpu_start
+        if self.level >= self.MEMORY:
+            import tracemalloc
+            metrics.memory_usage = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            if self._started_tracing:
+                tracemalloc.stop()
+        metrics.phases = self.phases
+        metrics.frontier_peak = frontier_peak
+        search_time = self.phases.get("search", (0, 0))[0]
+        metrics.expansion_rate = metrics.nodes_explored / search_time if search_time > 0 else None
+        return metrics
@@ -0,0 +1,237 @@
+from array import array
+import heapq
+import time
+
+from AIMetrics import AIMetrics
+
+
+class JunctionGraph:
+    def __init__(self, maze, goal_position):
+        """
+        Contracted graph of a maze's junctions, built for one goal.
+
+        Preprocessing runs in two passes over the maze's adjacency index:
+
+        1. Dead-end pruning repeatedly removes open cells with at most one
+           remaining neighbor (the goal is never removed). What is left is
+           the part of the maze that can lie on a route to the goal; every
+           pruned cell remembers the neighbor it hung from, so a start inside
+           a pruned branch can still walk out of it.
+        2. Corridor contraction keeps only junctions (remaining cells with a
+           degree other than 2) and the goal as nodes, joined by edges that
+           store the corridor's cells and its terrain cost in each direction.
+
+        :param maze: Maze instance; rebuild when its version changes.
+        :param goal_position: Tuple (x, y) every query searches toward.
+        """
+        start_time = time.perf_counter()
+        self.maze = maze
+        self.version = maze.version
+        self.goal_position = goal_position
+        self.cols = maze.cols
+        self.goal = goal_position[1] * maze.cols + goal_position[0]
+
+        size = maze.rows * maze.cols
+        self.hangs_from = array("i", [-1]) * size  # Pruned cell -> neighbor toward the kept maze
+        self.pruned = bytearray(size)
+        self.edge_of = array("i", [-1]) * size     # Corridor cell -> id of the edge it lies on
+        self.edges = []   # Edge id -> (node a, node b, corridor cells from a to b, cost a->b, cost b->a)
+        self.links = {}   # Node -> list of (neighbor node, edge id)
+
+        self._prune_dead_ends()
+        self._contract_corridors()
+
+        self.open_cells = size - sum(maze.cells())
+        self.reduction_ratio = len(self.links) / self.open_cells if self.open_cells else 0
+        self.precompute_time = time.perf_counter() - start_time
+
+    def find_path(self, start_position):
+        """
+        Search the junction graph from a start cell and expand the result to cells.
+
+        :param start_position: Tuple (x, y) to search from.
+        :return: AIMetrics; nodes_explored counts junction graph nodes.
+        """
+        start_time = time.perf_counter()
+        cols, costs = self.cols, self.maze.costs
+        start = start_position[1] * cols + start_position[0]
+
+        # Walk out of a pruned branch; the way out is unique
+        prefix = []
+        current = start
+        while self.pruned[current]:
+            current = self.hangs_from[current]
+            if current < 0:
+                return self._metrics([], 0, start_time)
+            prefix.append(current)
+
+        # Attach the start to the graph: either it is a node or it sits on one edge
+        virtual = []
+        if current not in self.links:
+            edge_id = self.edge_of[current]
+            if edge_id < 0:
+                return self._metrics([], 0, start_time)
+            a, b, cells, _, _ = self.edges[edge_id]
+            i = cells.index(current)
+            # Both ends are kept even when a == b: a loop can be left either way round
+            virtual.append((a, sum(costs[c] for c in cells[:i]) + costs[a], edge_id, False, i))
+            virtual.append((b, sum(costs[c] for c in cells[i + 1:]) + costs[b], edge_id, True, i))
+
+        node_path, expanded = self._search(current, virtual)
+        if node_path is None:
+            return self._metrics([], expanded, start_time)
+
+        cells_path = prefix
+        for i, (node, edge_id, forward, offset) in enumerate(node_path):
+            cells = self.edges[edge_id][2]
+            if i == 0 and virtual:
+                # Leave the start's corridor from the middle, toward whichever end was chosen
+                leg = cells[offset + 1:] if forward else cells[:offset][::-1]
+            else:
+                leg = cells if forward else cells[::-1]
+            cells_path.extend(leg)
+            cells_path.append(node)
+
+        path = []
+        for index in cells_path:
+            y, x = divmod(index, cols)
+            path.append((x, y))
+        return self._metrics(path, expanded, start_time)
+
+    # ------------------------------
+    # Preprocessing
+    # ------------------------------
+    def _prune_dead_ends(self):
+        offsets, targets = self.maze.adjacency()
+        grid, pruned, hangs_from = self.maze.cells(), self.pruned, self.hangs_from
+        degree = array("i", [offsets[i + 1] - offsets[i] for i in range(len(grid))])
+        queued = bytearray(len(grid))
+        stack = [i for i in range(len(grid)) if not grid[i] and degree[i] <= 1 and i != self.goal]
+        for index in stack:
+            queued[index] = 1
+        while stack:
+            current = stack.pop()
+            pruned[current] = 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if not pruned[neighbor]:
+                    hangs_from[current] = neighbor
+                    degree[neighbor] -= 1
+                    if degree[neighbor] <= 1 and not queued[neighbor] and neighbor != self.goal:
+                        queued[neighbor] = 1
+                        stack.append(neighbor)
+        self.degree = degree
+
+    def _contract_corridors(self):
+        grid, pruned, degree = self.maze.cells(), self.pruned, self.degree
+        kept = [i for i in range(len(grid)) if not grid[i] and not pruned[i]]
+        for index in kept:
+            if degree[index] != 2 or index == self.goal:
+                self.links[index] = []
+        for node in list(self.links):
+            self._trace_from(node)
+        # Loops made only of corridor cells have no junction; promote one cell per loop
+        for index in kept:
+            if index not in self.links and self.edge_of[index] < 0:
+                self.links[index] = []
+                self._trace_from(index)
+
+    def _trace_from(self, node):
+        offsets, targets = self.maze.adjacency()
+        pruned, costs, links, edge_of = self.pruned, self.maze.costs, self.links, self.edge_of
+        for first in targets[offsets[node]:offsets[node + 1]]:
+            if pruned[first]:
+                continue
+            if first in links:
+                if node < first:  # Adjacent nodes: add the empty corridor once
+                    self._add_edge(node, first, [])
+                continue
+            if edge_of[first] >= 0:
+                continue  # Already traced from the other end
+            cells = []
+            previous, current = node, first
+            while current not in links:
+                cells.append(current)
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if neighbor != previous and not pruned[neighbor]:
+                        previous, current = current, neighbor
+                        break
+            self._add_edge(node, current, cells)
+
+    def _add_edge(self, a, b, cells):
+        costs = self.maze.costs
+        edge_id = len(self.edges)
+        interior = sum(costs[c] for c in cells)
+        self.edges.append((a, b, cells, interior + costs[b], interior + costs[a]))
+        for cell in cells:
+            self.edge_of[cell] = edge_id
+        self.links[a].append((b, edge_id))
+        self.links[b].append((a, edge_id))
+
+    # ------------------------------
+    # Query
+    # ------------------------------
+    def _search(self, start, virtual):
+        """
+        A* over junction nodes.
+
+        :param start: Start cell (a node, or a corridor cell when virtual is set).
+        :param virtual: List of (node, cost, edge id, forward, offset) exits of a start that sits on a corridor.
+        :return: (list of (node, edge id, forward, offset) hops after the start, or None if
+                 the goal is unreachable; nodes expanded).
+        """
+        cols, goal = self.cols, self.goal
+        goal_y, goal_x = divmod(goal, cols)
+        g_cost = {start: 0}
+        hop = {start: None}  # Node -> (previous node, edge id, forward, offset)
+        closed = set()
+        open_set = [(0, start)]
+        expanded = 0
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+            if current == goal:
+                hops = []
+                while hop[current] is not None:
+                    previous, edge_id, forward, offset = hop[current]
+                    hops.append((current, edge_id, forward, offset))
+                    current = previous
+                hops.reverse()
+                return hops, expanded
+
+            if current == start and virtual:
+                moves = virtual
+            else:
+                moves = []
+                for neighbor, edge_id in self.links[current]:
+                    a, b, _, cost_ab, cost_ba = self.edges[edge_id]
+                    # A self-loop edge is usable in either direction; a == current means forward
+                    forward = a == current
+                    moves.append((neighbor, cost_ab if forward else cost_ba, edge_id, forward, 0))
+            for neighbor, cost, edge_id, forward, offset in moves:
+                tentative_g_cost = g_cost[current] + cost
+                if neighbor not in closed and tentative_g_cost < g_cost.get(neighbor, tentative_g_cost + 1):
+                    g_cost[neighbor] = tentative_g_cost
+                    hop[neighbor] = (current, edge_id, forward, offset)
+                    ny, nx = divmod(neighbor, cols)
+                    heapq.heappush(open_set, (tentative_g_cost + abs(nx - goal_x) + abs(ny - goal_y), neighbor))
+        return None, expanded
+
+    def _metrics(self, path, expanded, start_time):
+        costs, cols = self.maze.costs, self.cols
+        query_time = time.perf_counter() - start_time
+        return AIMetrics(
+            algorithm_name="Junction",
+            path=path,
+            steps=len(path),
+            nodes_explored=expanded,
+            path_length=sum(costs[y * cols + x] for x, y in path),
+            execution_time=query_time,
+            cpu_usage=0,
+            memory_usage=0,
+            precompute_time=self.precompute_time,
+            query_time=query_time,
+            reduction_ratio=self.reduction_ratio,
+        )
@@ -1,19 +1,159 @@
-import pygame
+import os
 import random
-from queue import Queue
-from CONSTANTS import *
+from array import array
+from itertools import count
+
+from MazeFile import MazeFile
+from PackedGrid import PackedGrid
+
+
+# Process-wide counter so that every grid state (across all Maze instances)
+# gets a unique version number that caches can safely key on.
+_versions = count(1)
 
 
 class Maze:
-    def __init__(self, rows, cols, cell_size):
+    # Generator name -> method building the grid, selected with Maze(..., generator=name)
+    GENERATORS = {
+        "backtracker": "generate_maze",
+        "eller": "generate_eller",
+    }
+    # Generator name -> version of its output; bump it whenever a change alters the mazes a seed gives,
+    # so that cached maze files of the old version are no longer used
+    GENERATOR_VERSIONS = {
+        "backtracker": 1,
+        "eller": 1,
+    }
+
+    def __init__(self, rows, cols, cell_size, terrain_density=0.0, max_terrain_cost=5, seed=None,
+                 generator="backtracker", cache_dir=None, grid=None):
+        """
+        :param rows: Number of rows in the grid.
+        :param cols: Number of columns in the grid.
+        :param cell_size: Size of one cell in pixels.
+        :param terrain_density: Fraction of open cells covered by slow terrain (0 for none).
+        :param max_terrain_cost: Highest traversal cost a terrain cell can get.
+        :param seed: Seed for walls and terrain; the same seed and size give the same maze. None picks one at random.
+        :param generator: Key of Maze.GENERATORS; "eller" is much faster on large grids.
+        :param cache_dir: Directory of maze files to reuse instead of generating; only used with an integer seed.
+        :param grid: Ready-made grid (bytearray or PackedGrid) to use instead of generating one.
+        """
         self.rows = rows
         self.cols = cols
         self.cell_size = cell_size
-        self.maze = self.generate_maze()
+        self.seed = seed
+        self.random = random.Random(seed)  # Private generator so seeded mazes don't depend on other random users
+        # Terrain draws from its own generator, so it comes out the same whether the walls were generated or loaded
+        self.terrain_random = random.Random(None if seed is None else f"{seed}:terrain")
+        self.generator = generator
+        if grid is None and cache_dir is not None and isinstance(seed, int):
+            grid = self._load_cached(cache_dir)
+        if grid is None:
+            grid = getattr(self, self.GENERATORS[generator])()
+            if cache_dir is not None and isinstance(seed, int):
+                os.makedirs(cache_dir, exist_ok=True)
+                self.save(MazeFile.cache_path(cache_dir, rows, cols, seed, generator,
+                                              self.GENERATOR_VERSIONS[generator]), grid)
+        # Flat row-major grid, one cell per entry (0 = open, 1 = wall), cell (x, y)
+        # at index y * cols + x. Either a bytearray with one byte per cell or a
+        # PackedGrid with one bit per cell over a memory-mapped maze file.
+        self.grid = grid
+        # Read-only per-row views over the same grid so maze[y][x] keeps
+        # working for the view and the player; edits go through set_cell().
+        self.maze = self._row_views(self.grid, readonly=True)
+        # Cost of stepping onto each cell, parallel to grid; see the costs property.
+        self._costs = None
+        self.max_cost = 1
+        self.listeners = []  # Callables notified with the changed (x, y) cells after every edit
+        if terrain_density > 0:
+            self.add_terrain(terrain_density, max_terrain_cost)
+        self.version = next(_versions)
+        self._adjacency = None  # (version, offsets, targets), built on demand
+        self._components = None  # (version, labels), built on demand
+
+    # ------------------------------
+    # Maze files
+    # ------------------------------
+    @classmethod
+    def open(cls, path, cell_size, terrain_density=0.0, max_terrain_cost=5):
+        """
+        Open a maze file written by save().
+
+        The walls stay in the memory-mapped file and are read cell by cell as
+        they are used, so opening takes the same time for any size. Terrain is
+        not stored in the file; it is scattered again from the saved seed.
+
+        :param path: Maze file.
+        :param cell_size: Size of one cell in pixels.
+        :param terrain_density: As for Maze().
+        :param max_terrain_cost: As for Maze().
+        :return: Maze over the file's grid.
+        :raises ValueError: If the file is not a maze file.
+        """
+        header, grid = MazeFile.load(path)
+        return cls(header["rows"], header["cols"], cell_size, terrain_density, max_terrain_cost,
+                   seed=header["seed"], generator=header["generator"], grid=grid)
+
+    def save(self, path, grid=None):
+        """
+        Write the walls to a maze file, one bit per cell.
+
+        :param path: Destination file.
+        :param grid: Grid to write instead of the maze's own (used while it is being built).
+        """
+        MazeFile.save(path, self.grid if grid is None else grid, self.rows, self.cols, self.seed,
+                      self.generator, self.GENERATOR_VERSIONS[self.generator])
+
+    def _load_cached(self, cache_dir):
+        """
+        Grid of this maze's (size, seed, generator) from the cache directory.
+
+        :return: PackedGrid, or None if the cache has no usable file for it.
+        """
+        path = MazeFile.cache_path(cache_dir, self.rows, self.cols, self.seed, self.generator,
+                                   self.GENERATOR_VERSIONS[self.generator])
+        if not os.path.exists(path):
+            return None
+        try:
+            header, grid = MazeFile.load(path)
+        except ValueError:
+            return None  # Damaged or from another format version; it gets regenerated and overwritten
+        expected = (self.rows, self.cols, self.seed, self.generator, self.GENERATOR_VERSIONS[self.generator])
+        if (header["rows"], header["cols"], header["seed"], header["generator"],
+                header["generator_version"]) != expected:
+            return None
+        return grid
+
+    @property
+    def costs(self):
+        """
+        Cost of stepping onto each cell, parallel to grid: 1 is normal floor,
+        higher values are mud, water and similar slow terrain.
+
+        The bytearray is only allocated when it is first needed, so a maze
+        opened from a file costs no memory per cell until costs are read.
+        """
+        if self._costs is None:
+            self._costs = bytearray(b"\x01") * (self.rows * self.cols)
+        return self._costs
+
+    @costs.setter
+    def costs(self, costs):
+        """Use a ready-made cost layer, e.g. one shared between processes; set max_cost to match."""
+        self._costs = costs
+
+    def cells(self):
+        """
+        The grid with one byte per cell, for passes that read every cell.
+
+        :return: The grid itself, or an unpacked copy when it is a PackedGrid.
+        """
+        return self.grid.unpack() if isinstance(self.grid, PackedGrid) else self.grid
 
 
     def generate_maze(self):
-        maze = [[1 for _ in range(self.cols)] for _ in range(self.rows)]
+        grid = bytearray(b"\x01") * (self.rows * self.cols)
+        maze = self._row_views(grid)
 
         # Start at (1, 1)
         stack = [(1, 1)]
@@ -23,7 +163,7 @@ class Maze:
         while stack:
             cx, cy = stack[-1]
             directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
-            random.shuffle(directions)
+            self.random.shuffle(directions)
 
             carved = False
             for dx, dy in directions:
@@ -44,7 +184,86 @@ class Maze:
         # Add dead ends
         self.add_dead_ends(maze)
 
-          # Ensure the exit is reachable
+        self._open_ends(maze)
+        return grid
+
+    def generate_eller(self, loop_chance=0.1):
+        """
+        Generate the maze one row of cells at a time with Eller's algorithm.
+
+        Cells sit at odd coordinates like in generate_maze(). Every cell of the
+        current row carries the label of the set it is connected to; walls to
+        the right are opened at random between different sets, then every set
+        sends at least one passage down to the next row. Only the labels of one
+        row are kept, so the working state is O(cols) and there is no
+        backtracking stack. Instead of the add_branches()/add_dead_ends()
+        probing passes, loops are added while the rows are built: a wall
+        between two cells of the same set is opened with probability loop_chance.
+
+        :param loop_chance: Probability of opening a wall that closes a loop.
+        :return: Flat grid, like generate_maze().
+        """
+        rows, cols, rnd = self.rows, self.cols, self.random
+        grid = bytearray(b"\x01") * (rows * cols)
+        width, height = (cols - 1) // 2, (rows - 1) // 2  # Cells per row and per column
+        parent = {}  # Union-find over the labels of the current row, reset every row
+
+        def find(label):
+            while label in parent:
+                label = parent[label]
+            return label
+
+        labels = list(range(width))
+        next_label = width
+        for j in range(height):
+            row = (2 * j + 1) * cols
+            grid[row + 1:row + 2 * width:2] = bytes(width)  # Open every cell of the row
+            last = j == height - 1
+
+            # Join neighbors in different sets at random; the last row joins all of them
+            parent.clear()
+            coins = bin(rnd.getrandbits(width) | 1 << width)  # "0b1" followed by one random bit per cell
+            for i in range(width - 1):
+                left, right = find(labels[i]), find(labels[i + 1])
+                if left != right:
+                    if last or coins[i + 3] == "1":
+                        grid[row + 2 * i + 2] = 0
+                        parent[right] = left
+                elif rnd.random() < loop_chance:
+                    grid[row + 2 * i + 2] = 0
+            if last:
+                break
+            labels = [find(label) for label in labels]
+
+            # Carry every set down at least once, more often at random
+            below = row + cols
+            coins = bin(rnd.getrandbits(width) | 1 << width)
+            next_labels = [-1] * width
+            stranded = {}  # Set label -> cells of a set with no passage down yet
+            for i, label in enumerate(labels):
+                if coins[i + 3] == "1":
+                    next_labels[i] = label
+                else:
+                    stranded.setdefault(label, []).append(i)
+            for i, label in enumerate(next_labels):
+                if label >= 0:
+                    stranded.pop(label, None)
+            for cells in stranded.values():
+                i = cells[rnd.randrange(len(cells))]
+                next_labels[i] = labels[i]
+            for i, label in enumerate(next_labels):
+                if label >= 0:
+                    grid[below + 2 * i + 1] = 0
+                else:
+                    next_labels[i] = next_label
+                    next_label += 1
+            labels = next_labels
+
+        self._open_ends(self._row_views(grid))
+        return grid
+
+    def _open_ends(self, maze):
+        """Make sure the start and the exit are open and the exit touches the maze."""
         goal_x, goal_y = self.cols - 2, self.rows - 2
         maze[goal_y][goal_x] = 0  # Make sure the goal is open
         maze[1][1] = 0  # Make sure the start is open
@@ -55,13 +274,218 @@ class Maze:
         ):
             maze[goal_y - 1][goal_x] = 0  # Carve a path to the goal
 
+    def _row_views(self, grid, readonly=False):
+        """
+        Split a flat grid into per-row memoryviews without copying.
+
+        :param grid: Flat row-major buffer of rows * cols cells.
+        :param readonly: Whether the returned rows reject writes.
+        :return: List of row views indexable as rows[y][x].
+        """
+        if isinstance(grid, PackedGrid):
+            return grid.rows(self.cols)  # Read-only already
+        view = memoryview(grid)
+        if readonly:
+            view = view.toreadonly()
+        return [view[y * self.cols:(y + 1) * self.cols] for y in range(self.rows)]
+
+    def index(self, x, y):
+        """Flat grid index of cell (x, y)."""
+        return y * self.cols + x
+
+    def position(self, index):
+        """(x, y) position of a flat grid index."""
+        y, x = divmod(index, self.cols)
+        return x, y
 
-        return maze
+    def is_open(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.grid[y * self.cols + x] == 0
+
+    def set_cell(self, x, y, value):
+        """
+        Change a single cell and bump the maze version if it actually changed.
+
+        :param x: Column of the cell.
+        :param y: Row of the cell.
+        :param value: 0 for open, 1 for wall.
+        """
+        self.apply_edits([(x, y, value)])
+
+    def toggle_wall(self, x, y):
+        """Turn a wall into floor or floor into a wall."""
+        self.apply_edits([(x, y, 1 - self.grid[y * self.cols + x])])
+
+    def apply_edits(self, edits):
+        """
+        Apply a batch of wall edits, bump the version once and notify listeners.
+
+        :param edits: Iterable of (x, y, value) with value 0 for open, 1 for wall.
+        :return: List of (x, y) cells that actually changed.
+        """
+        changed = []
+        for x, y, value in edits:
+            index = y * self.cols + x
+            if self.grid[index] != value:
+                self.grid[index] = value
+                changed.append((x, y))
+        if changed:
+            self.version = next(_versions)
+            self._notify(changed)
+        return changed
+
+    def add_listener(self, listener):
+        """
+        Register a callable to be told about cell changes, e.g. an incremental planner.
+
+        :param listener: Callable taking a list of changed (x, y) cells.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def _notify(self, changed):
+        for listener in self.listeners:
+            listener(changed)
+
+    def set_cost(self, x, y, cost):
+        """
+        Change the traversal cost of a single cell.
+
+        :param x: Column of the cell.
+        :param y: Row of the cell.
+        :param cost: Integer cost of stepping onto the cell, 1-255.
+        """
+        index = y * self.cols + x
+        if self.costs[index] != cost:
+            self.costs[index] = cost
+            self.max_cost = max(self.max_cost, cost)
+            self.version = next(_versions)
+            self._notify([(x, y)])
+
+    def add_terrain(self, density, max_cost):
+        """
+        Scatter patches of slow terrain over the open cells.
+
+        Each patch grows from a random open cell to its open neighbors and gets
+        one cost between 2 and max_cost.
+
+        :param density: Fraction of open cells to cover.
+        :param max_cost: Highest cost a patch can get.
+        """
+        grid, costs, cols = self.cells(), self.costs, self.cols
+        size = self.rows * cols
+        open_cells = [index for index in range(size) if not grid[index]]
+        if not open_cells or max_cost < 2:
+            return
+        patch_size = 12
+        rnd = self.terrain_random
+        painted_cells = []
+        for _ in range(int(len(open_cells) * density) // patch_size + 1):
+            cost = rnd.randint(2, max_cost)
+            patch = [rnd.choice(open_cells)]
+            painted = 0
+            while patch and painted < patch_size:
+                index = patch.pop(rnd.randrange(len(patch)))
+                if costs[index] != 1:
+                    continue
+                costs[index] = cost
+                painted += 1
+                painted_cells.append(self.position(index))
+                x = index % cols
+                for neighbor in (index - 1 if x > 0 else -1, index + 1 if x < cols - 1 else -1,
+                                 index - cols, index + cols):
+                    if 0 <= neighbor < size and not grid[neighbor] and costs[neighbor] == 1:
+                        patch.append(neighbor)
+            self.max_cost = max(self.max_cost, cost)
+        self.version = next(_versions)
+        self._notify(painted_cells)
+
+    def adjacency(self):
+        """
+        Open-cell adjacency in compressed sparse row (CSR) form.
+
+        The neighbors of cell i are targets[offsets[i]:offsets[i + 1]], listed
+        left, right, up, down. The index is built once per maze version and
+        shared by every solver; any set_cell() that changes the grid makes
+        the next call rebuild it.
+
+        :return: Tuple (offsets, targets) of array('i').
+        """
+        if self._adjacency is None or self._adjacency[0] != self.version:
+            self._adjacency = (self.version,) + self._build_adjacency()
+        return self._adjacency[1], self._adjacency[2]
+
+    def components(self):
+        """
+        Connected-component label of every cell.
+
+        Open cells that can reach each other share a label (0, 1, 2, ...);
+        walls are labelled -1. Like the adjacency index, the labels are
+        computed once per maze version.
+
+        :return: array('i') of labels indexed by flat cell index.
+        """
+        if self._components is None or self._components[0] != self.version:
+            self._components = (self.version, self._build_components())
+        return self._components[1]
+
+    def is_connected(self, a, b):
+        """
+        Whether positions a and b lie in the same open region.
+
+        :param a: Tuple (x, y).
+        :param b: Tuple (x, y).
+        """
+        labels = self.components()
+        label = labels[a[1] * self.cols + a[0]]
+        return label >= 0 and label == labels[b[1] * self.cols + b[0]]
+
+    def _build_components(self):
+        offsets, targets = self.adjacency()
+        grid = self.cells()
+        labels = array("i", [-1]) * (self.rows * self.cols)
+        label = 0
+        for seed, cell in enumerate(grid):
+            if cell or labels[seed] >= 0:
+                continue
+            labels[seed] = label
+            stack = [seed]
+            while stack:
+                current = stack.pop()
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if labels[neighbor] < 0:
+                        labels[neighbor] = label
+                        stack.append(neighbor)
+            label += 1
+        return labels
+
+    def _build_adjacency(self):
+        grid, rows, cols = self.cells(), self.rows, self.cols
+        size = rows * cols
+        offsets = array("i", bytes(4 * (size + 1)))
+        targets = array("i")
+        append = targets.append
+        for index in range(size):
+            offsets[index] = len(targets)
+            if grid[index]:
+                continue
+            x = index % cols
+            if x > 0 and not grid[index - 1]:
+                append(index - 1)
+            if x < cols - 1 and not grid[index + 1]:
+                append(index + 1)
+            if index >= cols and not grid[index - cols]:
+                append(index - cols)
+            if index + cols < size and not grid[index + cols]:
+                append(index + cols)
+        offsets[size] = len(targets)
+        return offsets, targets
 
     def add_branches(self, maze):
         branch_count = (self.cols * self.rows) // 20  # Adjust for difficulty
         for _ in range(branch_count):
-            x, y = random.randint(1, self.cols - 2), random.randint(1, self.rows - 2)
+            x, y = self.random.randint(1, self.cols - 2), self.random.randint(1, self.rows - 2)
 
             # Only add branches in walls with enough space
             if maze[y][x] == 1:
@@ -79,7 +503,7 @@ class Maze:
     def add_dead_ends(self, maze):
         dead_end_count = (self.cols * self.rows) // 15  # Adjust for difficulty
         for _ in range(dead_end_count):
-            x, y = random.randint(1, self.cols - 2), random.randint(1, self.rows - 2)
+            x, y = self.random.randint(1, self.cols - 2), self.random.randint(1, self.rows - 2)
 
             # Only add dead ends to open spaces
             if maze[y][x] == 0 and self.is_valid_dead_end(maze, x, y):
@@ -95,40 +519,6 @@ class Maze:
         return open_neighbors == 1
 
 
-    def draw(self, screen, player_pos, exit_pos, ai_path):
-        for y in range(self.rows):
-            for x in range(self.cols):
-                color = CONSTANTS.WHITE if self.maze[y][x] == 0 else CONSTANTS.BLACK
-                pygame.draw.rect(
-                    screen,
-                    color,
-                    (x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
-                )
-
-        # Draw AI path
-        for pos in ai_path:
-            pygame.draw.rect(
-                screen,
-                CONSTANTS.RED,
-                (pos[0] * self.cell_size, pos[1] * self.cell_size, self.cell_size, self.cell_size)
-            )
-
-        # Draw player
-        pygame.draw.rect(
-            screen,
-            CONSTANTS.GREEN,
-            (player_pos[0] * self.cell_size, player_pos[1] * self.cell_size, self.cell_size, self.cell_size)
-        )
-
-        # Draw exit
-        pygame.draw.rect(
-            screen,
-            CONSTANTS.YELLOW,
-            (exit_pos[0] * self.cell_size, exit_pos[1] * self.cell_size, self.cell_size, self.cell_size)
-        )
-
-
-
 # if __name__ == "__main__":
 #     maze = Maze(GRID_SIZE)
 #     for row in maze.maze:
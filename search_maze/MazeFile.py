@@ -0,0 +1,80 @@
+import mmap
+import os
+import struct
+
+from PackedGrid import PackedGrid
+
+
+class MazeFile:
+    """
+    Binary maze file: a fixed header followed by the wall grid at one bit per cell.
+
+    Header, little-endian: magic b"MAZE", format version (u16), generator
+    version (u16), flags (u16, bit 0 = seed present), reserved (u16), rows
+    (u32), cols (u32), seed (i64), generator name (16 bytes, NUL padded).
+    Terrain costs are not stored; they are regenerated from the seed.
+    """
+    MAGIC = b"MAZE"
+    FORMAT_VERSION = 1
+    HEADER = struct.Struct("<4sHHHHIIq16s")
+    HAS_SEED = 1
+
+    @staticmethod
+    def save(path, grid, rows, cols, seed, generator, generator_version):
+        """
+        Write a grid to a maze file, atomically replacing any existing file.
+
+        :param path: Destination file.
+        :param grid: One-byte-per-cell grid (or PackedGrid) of rows * cols cells.
+        :param rows: Number of rows.
+        :param cols: Number of columns.
+        :param seed: Integer seed the grid was generated from, or None.
+        :param generator: Generator name, a key of Maze.GENERATORS.
+        :param generator_version: Version of that generator's output.
+        """
+        bits = grid.buffer[grid.offset:grid.offset + (grid.size + 7) // 8] \
+            if isinstance(grid, PackedGrid) else PackedGrid.pack(grid)
+        header = MazeFile.HEADER.pack(MazeFile.MAGIC, MazeFile.FORMAT_VERSION, generator_version,
+                                      MazeFile.HAS_SEED if seed is not None else 0, 0, rows, cols,
+                                      seed if seed is not None else 0, generator.encode("ascii"))
+        temporary = f"{path}.{os.getpid()}.tmp"  # Concurrent writers of the same cache entry never see half a file
+        with open(temporary, "wb") as file:
+            file.write(header)
+            file.write(bits)
+        os.replace(temporary, path)
+
+    @staticmethod
+    def load(path):
+        """
+        Memory-map a maze file.
+
+        The mapping is copy-on-write: cells edited in the Maze change the
+        process's private copy of the page, never the file.
+
+        :param path: Maze file to open.
+        :return: Tuple (header dict with rows, cols, seed, generator, generator_version; PackedGrid).
+        :raises ValueError: If the file is not a maze file or is truncated.
+        """
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(buffer) < MazeFile.HEADER.size:
+            raise ValueError(f"{path} is too short to be a maze file")
+        magic, version, generator_version, flags, _, rows, cols, seed, generator = \
+            MazeFile.HEADER.unpack_from(buffer)
+        if magic != MazeFile.MAGIC or version != MazeFile.FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {MazeFile.FORMAT_VERSION} maze file")
+        if len(buffer) < MazeFile.HEADER.size + (rows * cols + 7) // 8:
+            raise ValueError(f"{path} is truncated")
+        header = {
+            "rows": rows,
+            "cols": cols,
+            "seed": seed if flags & MazeFile.HAS_SEED else None,
+            "generator": generator.rstrip(b"\0").decode("ascii"),
+            "generator_version": generator_version,
+        }
+        return header, PackedGrid(buffer, MazeFile.HEADER.size, rows * cols)
+
+    @staticmethod
+    def cache_path(cache_dir, rows, cols, seed, generator, generator_version):
+        """File in cache_dir holding the maze for (size, seed, generator and its version)."""
+        return os.path.join(cache_dir, f"{generator}-v{generator_version}-{cols}x{rows}-{seed}.maze")
@@ -1,5 +1,7 @@
+import os
 import pygame
 import sys
+import time
 
 from CONSTANTS import CONSTANTS
 from Maze import Maze
@@ -7,19 +9,30 @@ from Player import Player
 from AI import AI
 from View.GameView import GameView
 from AIMetrics import AIMetrics
-
-# Pygame initialization
-pygame.init()
-pygame.display.set_caption("Maze Game")
-
+from Instrumentation import Instrumentation
+from SolverWorker import SolverWorker
+from SearchStepper import SearchStepper
+from FrameBudget import FrameBudget
 
 
 ### --- GAME CLASS --- ###
 class MazeGame:
+    SAVE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved.maze")  # Written with S, read with L
 
     def __init__(self):
-        
+        # Pygame is initialized here rather than on import, so importing the game has no side effects
+        pygame.init()
+        pygame.display.set_caption("Maze Game")
         CONSTANTS.set_screen_size()
+        self.terrain_density = 0.0  # Share of open cells covered by slow terrain, toggled with T
+        self.live_hint = False      # Redraw the hint path on every move, toggled with H
+        self.instrumentation_level = Instrumentation.OFF  # Solver measurements, cycled with I
+        self.generator = "backtracker"  # Key of Maze.GENERATORS, toggled with G
+        self.worker = SolverWorker()    # Runs button searches in background processes, see request_solve()
+        self.solve_request = None       # (maze version, start, labels) of the search the worker is running
+        self.animate_search = False     # Step searches a slice per frame and draw their progress, toggled with A
+        self.stepper = None             # SearchStepper being animated, kept after it ends to show what it explored
+        self.frame_budget = FrameBudget()
         self.setup_ui()
         self.setup_game()
         
@@ -31,22 +44,28 @@ class MazeGame:
         keys = pygame.key.get_pressed()
         current_time = pygame.time.get_ticks()
 
+        moved = False
         if current_time - self.last_move_time >= self.movement_cooldown:
             if keys[pygame.K_UP]:
-                self.player.move(self.maze.maze, "UP")
+                moved = self.player.move(self.maze, "UP")
                 self.last_move_time = current_time
             elif keys[pygame.K_DOWN]:
-                self.player.move(self.maze.maze, "DOWN")
+                moved = self.player.move(self.maze, "DOWN")
                 self.last_move_time = current_time
             elif keys[pygame.K_LEFT]:
-                self.player.move(self.maze.maze, "LEFT")
+                moved = self.player.move(self.maze, "LEFT")
                 self.last_move_time = current_time
             elif keys[pygame.K_RIGHT]:
-                self.player.move(self.maze.maze, "RIGHT")
+                moved = self.player.move(self.maze, "RIGHT")
                 self.last_move_time = current_time
 
         self.player_position = self.player.position  # Ensure this is updated
 
+        # Live hint: re-read the path from the cached goal distance field, no new search
+        if moved and self.live_hint:
+            self.ai_metrics = self.ai.hint(tuple(self.player.position), self.maze)
+            self.view.update_metrics(self.ai_metrics)
+
 
     def handle_input(self, event):
 
@@ -54,6 +73,50 @@ class MazeGame:
             # Handle grid size input
             self.view.grid_size_field.handle_event(event)
 
+            # Toggle weighted terrain (outside the grid size field) and start a new maze
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_t and not self.view.grid_size_field.active:
+                self.terrain_density = 0.0 if self.terrain_density else 0.2
+                self.start_game()
+
+            # Switch between the maze generators and start a new maze
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_g and not self.view.grid_size_field.active:
+                self.generator = "eller" if self.generator == "backtracker" else "backtracker"
+                self.start_game()
+
+            # Save the current maze, or load the saved one in place of it
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_s and not self.view.grid_size_field.active:
+                self.save_maze(self.SAVE_FILE)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_l and not self.view.grid_size_field.active:
+                self.load_maze(self.SAVE_FILE)
+
+            # Toggle animated searches; Escape stops the running one and keeps its best path so far
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_a and not self.view.grid_size_field.active:
+                self.animate_search = not self.animate_search
+                print(f"Animated search: {'on' if self.animate_search else 'off'}")
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE and self.stepper is not None:
+                self.stepper.abort()
+                self.ai_metrics = self.stepper.result()
+                self.view.update_metrics(self.ai_metrics)
+
+            # Toggle the live hint, which redraws the path to the exit after every move
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_h and not self.view.grid_size_field.active:
+                self.live_hint = not self.live_hint
+                if self.live_hint:
+                    self.ai_metrics = self.ai.hint(tuple(self.player.position), self.maze)
+                    self.view.update_metrics(self.ai_metrics)
+
+            # Cycle the solver instrumentation level; cached results were measured at the old level
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_i and not self.view.grid_size_field.active:
+                self.instrumentation_level = (self.instrumentation_level + 1) % len(Instrumentation.LEVEL_NAMES)
+                self.ai.instrumentation.level = self.instrumentation_level
+                self.ai.cache.clear()
+                self.worker.cancel()
+                print(f"Instrumentation: {Instrumentation.LEVEL_NAMES[self.instrumentation_level]}")
+
+            # Right click inside the maze toggles a wall
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+                self.toggle_wall_at(event.pos)
+
             # Check button clicks
             if event.type == pygame.MOUSEBUTTONDOWN:
 
@@ -76,24 +139,150 @@ class MazeGame:
                                     self.setup_game()
                             except ValueError:
                                 print("Invalid grid size")
-                        else:
-                            if button.text == "BFS":
-                                self.ai_metrics = self.ai.bfs(tuple(self.player.position), self.maze.maze)
-                            elif button.text == "DFS":
-                                self.ai_metrics = self.ai.dfs(tuple(self.player.position), self.maze.maze)
-                            elif button.text == "A*":
-                                self.ai_metrics = self.ai.a_star(tuple(self.player.position), self.maze.maze)
-                            self.view.update_metrics(self.ai_metrics)
+                        elif self.animate_search and button.text in SearchStepper.ALGORITHMS:
+                            self.start_stepper(button.text)
+                        elif button.text == "Compare all":
+                            self.request_solve(["BFS", "DFS", "A*"])
+                        elif button.text == "D* Lite":
+                            # Stays on this AI: its planner is kept between calls and repaired after wall edits
+                            self.ai_metrics = self.ai.solve(button.text, tuple(self.player.position), self.maze)
+                            self.view.update_metrics(self.ai_metrics, self.ai.cache)
+                        elif button.text in AI.ALGORITHMS:
+                            self.request_solve([button.text])
                 
                 if self.view.exit_button.is_clicked(event.pos):
                     self.game_over=True
 
 
+    def request_solve(self, labels):
+        """
+        Run searches in the background from the player's position, replacing any search still running.
+        A single search answered by the path cache is shown right away instead.
+
+        :param labels: Keys of AI.ALGORITHMS; several are shown side by side when they are all done.
+        """
+        self.stepper = None
+        start = tuple(self.player.position)
+        if len(labels) == 1:
+            metrics = self.ai.cache.get(self.maze.version, start, self.ai.goal_position, labels[0])
+            if metrics is not None:
+                self.worker.cancel()
+                self.solve_request = None
+                self.ai_metrics = metrics
+                self.view.update_metrics(metrics, self.ai.cache)
+                return
+        self.worker.submit(self.maze, [(start, self.ai.goal_position, label) for label in labels],
+                           self.instrumentation_level)
+        self.solve_request = (self.maze.version, start, labels)
+        self.view.show_searching(labels)
+
+    def poll_solver(self):
+        """
+        Apply the background search results once they are all in; called every frame.
+        """
+        results = self.worker.poll()
+        if results is None:
+            if self.worker.error is not None and self.solve_request is not None:
+                print(f"Search failed: {self.worker.error}")
+                self.view.show_message("Search failed")
+                self.solve_request = None
+            return
+        version, start, labels = self.solve_request
+        self.solve_request = None
+        for label, metrics in zip(labels, results):
+            self.ai.cache.put(version, start, self.ai.goal_position, label, metrics)
+        self.ai_metrics = results[-1]
+        if len(results) == 1:
+            self.view.update_metrics(self.ai_metrics, self.ai.cache)
+        else:
+            self.view.update_comparison(results)
+
+    def start_stepper(self, label):
+        """
+        Start an animated search from the player's position, replacing any search still running.
+
+        :param label: Key of SearchStepper.ALGORITHMS.
+        """
+        self.worker.cancel()
+        self.solve_request = None
+        self.stepper = SearchStepper(label, tuple(self.player.position), self.ai.goal_position, self.maze)
+
+    def advance_stepper(self):
+        """
+        Run the animated search for this frame's slice and show its progress.
+
+        :return: Seconds spent searching.
+        """
+        if self.stepper is None or self.stepper.done:
+            return 0.0
+        start_time = time.perf_counter()
+        self.stepper.step(max_time=self.frame_budget.slice)
+        self.ai_metrics = self.stepper.result()
+        self.view.update_metrics(self.ai_metrics)
+        return time.perf_counter() - start_time
+
+    def save_maze(self, path):
+        """
+        Write the current maze to a maze file, reporting a failure in the sidebar instead of stopping the game.
+        """
+        try:
+            self.maze.save(path)
+        except OSError as error:
+            print(f"Could not save maze: {error}")
+            self.view.show_message("Could not save maze")
+            return
+        print(f"Maze saved to {path}")
+
+    def load_maze(self, path):
+        """
+        Start a new game on a maze file, resizing the screen grid to the maze's rows and columns.
+        A maze with more cells than the maze area has pixels is refused.
+        """
+        try:
+            maze = Maze.open(path, CONSTANTS.CELL_SIZE, terrain_density=self.terrain_density)
+        except (OSError, ValueError) as error:
+            print(f"Could not load maze: {error}")
+            self.view.show_message("Could not load maze")
+            return
+        if not CONSTANTS.fits_screen(maze.rows, maze.cols):
+            print(f"Could not load maze: {maze.cols}x{maze.rows} cells do not fit the screen")
+            self.view.show_message("Maze too large for the screen")
+            return
+        CONSTANTS.set_screen_size(maze.cols, maze.rows)
+        self.current_grid_size = maze.cols
+        self.view.grid_size_field.text = str(maze.cols)
+        maze.cell_size = CONSTANTS.CELL_SIZE
+        self.start_game(maze)
+
+    def toggle_wall_at(self, mouse_pos):
+        """
+        Toggle the wall under the mouse, keeping the border, player and exit intact.
+        If the D* Lite path is on screen it is repaired right away.
+        """
+        x, y = mouse_pos[0] // self.maze.cell_size, mouse_pos[1] // self.maze.cell_size
+        if not (0 < x < self.maze.cols - 1 and 0 < y < self.maze.rows - 1):
+            return
+        if [x, y] in (self.player.position, list(self.exit_position)):
+            return
+        self.maze.toggle_wall(x, y)
+        self.worker.cancel()  # A search still running was for the old walls
+        self.solve_request = None
+        self.stepper = None
+        if self.ai_metrics.algorithm_name == "D* Lite":
+            self.ai_metrics = self.ai.solve("D* Lite", tuple(self.player.position), self.maze)
+            self.view.update_metrics(self.ai_metrics, self.ai.cache)
+
     def draw(self):
-        # Draw the maze
-        self.view.draw_maze(self.maze, self.player_position, self.exit_position, self.ai_metrics.path)
+        """
+        Draw the frame.
+        :return: List of screen rectangles that changed, for pygame.display.update().
+        """
+        # Draw the maze, with the animated search's progress under the path
+        rects = self.view.draw_maze(self.maze, self.player_position, self.exit_position, self.ai_metrics.path,
+                                    self.stepper)
         # Draw the sidebar
-        self.view.draw_sidebar()
+        rects += self.view.draw_sidebar()
+        return rects
 
 
 
@@ -118,6 +307,7 @@ class MazeGame:
             pygame.display.flip()
             pygame.time.delay(300)  # Pause for 200ms
 
+        self.view.invalidate()  # The blinking drew over the whole screen
         self.start_game()
 
 
@@ -125,7 +315,7 @@ class MazeGame:
         game = self
         running = True
         while running:
-            self.screen.fill(CONSTANTS.BLACK)
+            frame_start = time.perf_counter()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -137,14 +327,18 @@ class MazeGame:
 
             game.handle_player_movement()
 
-            game.update()
+            game.poll_solver()
+            search_time = game.advance_stepper()
 
-            self.screen.fill(CONSTANTS.BLACK)
+            game.update()
 
-            game.draw()
-            pygame.display.flip()
+            # The maze area is redrawn only where it changed, so only those rectangles are pushed
+            pygame.display.update(game.draw())
+            # Size the next search slice from how long this frame took before waiting for the tick
+            self.frame_budget.update(time.perf_counter() - frame_start, search_time)
             self.clock.tick(60)
 
+        self.worker.close()
         pygame.quit()
 
 
@@ -195,24 +389,35 @@ class MazeGame:
 
         self.start_game()     
 
-    def start_game(self):
+    def start_game(self, maze=None):
         """
         Reset the maze, player position, and AI helper path to start a new game.
+
+        :param maze: Maze to play instead of generating a new one, e.g. one loaded from a file.
         """
         # Regenerate the maze
-        self.maze = Maze(CONSTANTS.ROWS, CONSTANTS.COLS, CONSTANTS.CELL_SIZE)
+        if maze is None:
+            maze = Maze(CONSTANTS.ROWS, CONSTANTS.COLS, CONSTANTS.CELL_SIZE, terrain_density=self.terrain_density,
+                        generator=self.generator)
+        self.maze = maze
 
         # Reset player position
         self.player = Player((1, 1))
         self.player_position = [1, 1]
 
         # Reset exit position
-        self.exit_position = [CONSTANTS.COLS - 2, CONSTANTS.ROWS - 2]
+        self.exit_position = [self.maze.cols - 2, self.maze.rows - 2]
 
         # Reset AI path
         self.ai = AI((1, 1), tuple(self.exit_position))
+        self.ai.instrumentation.level = self.instrumentation_level
         self.ai_metrics:AIMetrics = AIMetrics("A*", [], 0, 0, 0, 0, 0, 0)
 
+        # Drop any search still running on the previous maze
+        self.worker.cancel()
+        self.solve_request = None
+        self.stepper = None
+
         # Reset game state
         self.game_over = False
 
@@ -0,0 +1,101 @@
+class PackedGrid:
+    def __init__(self, buffer, offset, size):
+        """
+        Flat wall grid stored as one bit per cell, usually over a memory-mapped file.
+
+        Indexing matches the bytearray grid of Maze (grid[y * cols + x] is 1
+        for a wall, 0 for open), so solvers can use either. Bits are read on
+        demand; nothing is unpacked up front, and with an mmap buffer only the
+        pages actually touched become resident.
+
+        :param buffer: Writable or read-only buffer (bytearray, mmap, ...) holding the bits.
+        :param offset: Byte offset of cell 0 in the buffer.
+        :param size: Number of cells.
+        """
+        self.buffer = buffer
+        self.offset = offset
+        self.size = size
+
+    @staticmethod
+    def pack(grid):
+        """
+        Pack a one-byte-per-cell grid into bits, cell i at bit i % 8 of byte i // 8.
+
+        :param grid: Bytes-like grid of 0/1 values.
+        :return: bytes of length ceil(len(grid) / 8).
+        """
+        padded = bytes(grid) + bytes(-len(grid) % 8)
+        # Cells bit, bit + 8, bit + 16, ... go to the same bit of consecutive bytes;
+        # each plane is shifted into place as one big integer instead of cell by cell
+        value = 0
+        for bit in range(8):
+            value |= int.from_bytes(padded[bit::8], "little") << bit
+        return value.to_bytes(len(padded) // 8, "little")
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0 or index >= self.size:
+            raise IndexError("cell index out of range")
+        return self.buffer[self.offset + (index >> 3)] >> (index & 7) & 1
+
+    def __setitem__(self, index, value):
+        if index < 0 or index >= self.size:
+            raise IndexError("cell index out of range")
+        position = self.offset + (index >> 3)
+        if value:
+            self.buffer[position] |= 1 << (index & 7)
+        else:
+            self.buffer[position] &= ~(1 << (index & 7)) & 0xFF
+
+    def __iter__(self):
+        size, index = self.size, 0
+        for byte in self.buffer[self.offset:self.offset + (size + 7) // 8]:
+            for bit in range(8):
+                if index == size:
+                    return
+                yield byte >> bit & 1
+                index += 1
+
+    def unpack(self):
+        """Return the grid as a bytearray with one byte per cell, the inverse of pack()."""
+        length = (self.size + 7) // 8
+        value = int.from_bytes(self.buffer[self.offset:self.offset + length], "little")
+        ones = int.from_bytes(b"\x01" * length, "little")  # Lowest bit of every byte
+        grid = bytearray(length * 8)
+        for bit in range(8):
+            grid[bit::8] = (value >> bit & ones).to_bytes(length, "little")
+        del grid[self.size:]
+        return grid
+
+    def rows(self, cols):
+        """
+        Per-row accessors so that rows[y][x] reads a cell, like Maze.maze.
+
+        :param cols: Row length of the grid.
+        :return: List of PackedRow, one per row.
+        """
+        return [PackedRow(self, y * cols, cols) for y in range(self.size // cols)]
+
+
+class PackedRow:
+    __slots__ = ("grid", "start", "length")
+
+    def __init__(self, grid, start, length):
+        """Read-only view of one row of a PackedGrid."""
+        self.grid = grid
+        self.start = start
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, x):
+        if x < 0 or x >= self.length:
+            raise IndexError("column out of range")
+        return self.grid[self.start + x]
+
+    def __iter__(self):
+        for x in range(self.length):
+            yield self.grid[self.start + x]
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+
+class PathCache:
+    def __init__(self, max_entries=64, max_path_cells=2_000_000):
+        """
+        LRU cache of solver results keyed on (maze version, start, goal, algorithm).
+
+        Every cell change gives the maze a new version, so entries for an older
+        version can never be hit again; they are dropped as soon as a lookup
+        or store arrives for a newer version.
+
+        :param max_entries: Maximum number of cached results.
+        :param max_path_cells: Maximum number of path cells held across all results.
+        """
+        self.max_entries = max_entries
+        self.max_path_cells = max_path_cells
+        self.entries = OrderedDict()  # key -> AIMetrics, least recently used first
+        self.path_cells = 0
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version, start, goal, algorithm):
+        """
+        Look up a cached result and mark it as recently used.
+
+        :return: The cached AIMetrics, or None on a miss.
+        """
+        self._check_version(version)
+        key = (version, tuple(start), tuple(goal), algorithm)
+        metrics = self.entries.get(key)
+        if metrics is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return metrics
+
+    def put(self, version, start, goal, algorithm, metrics):
+        """
+        Store a result, evicting least recently used entries to stay within both limits.
+        """
+        self._check_version(version)
+        cells = metrics.steps
+        if cells > self.max_path_cells:
+            return  # Would evict everything else and still not fit
+        key = (version, tuple(start), tuple(goal), algorithm)
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.path_cells -= previous.steps
+        self.entries[key] = metrics
+        self.path_cells += cells
+        while len(self.entries) > self.max_entries or self.path_cells > self.max_path_cells:
+            _, evicted = self.entries.popitem(last=False)
+            self.path_cells -= evicted.steps
+
+    def clear(self):
+        """Drop every entry; hit and miss counters are kept."""
+        self.entries.clear()
+        self.path_cells = 0
+        self.version = None
+
+    def _check_version(self, version):
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    def __str__(self):
+        return f"Cache: {self.hits} hits / {self.misses} misses ({len(self.entries)} entries)"
@@ -3,12 +3,22 @@ class Player:
         self.position = list(start_position)
 
     def move(self, maze, direction):
+        """
+        Move one cell in a direction if it is open.
+
+        :param maze: Maze or ChunkedMaze; cells are read through its is_open(x, y).
+        :param direction: "UP", "DOWN", "LEFT" or "RIGHT".
+        :return: True if the player moved.
+        """
         x, y = self.position
-        if direction == "UP" and maze[y - 1][x] == 0:
+        if direction == "UP" and maze.is_open(x, y - 1):
             self.position[1] -= 1
-        elif direction == "DOWN" and maze[y + 1][x] == 0:
+        elif direction == "DOWN" and maze.is_open(x, y + 1):
             self.position[1] += 1
-        elif direction == "LEFT" and maze[y][x - 1] == 0:
+        elif direction == "LEFT" and maze.is_open(x - 1, y):
             self.position[0] -= 1
-        elif direction == "RIGHT" and maze[y][x + 1] == 0:
+        elif direction == "RIGHT" and maze.is_open(x + 1, y):
             self.position[0] += 1
+        else:
+            return False
+        return True
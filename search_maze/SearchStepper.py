@@ -0,0 +1,228 @@
+from array import array
+from collections import deque
+import heapq
+import time
+
+from AIMetrics import AIMetrics
+
+
+class SearchStepper:
+    # Algorithm label (as in AI.ALGORITHMS) -> frontier kind and whether terrain costs count
+    ALGORITHMS = {
+        "BFS": ("queue", False),
+        "DFS": ("stack", False),
+        "A*": ("heuristic", False),
+        "Dijkstra": ("cost", True),
+        "Terrain A*": ("heuristic", True),
+    }
+    UNSEEN, FRONTIER, CLOSED = 0, 1, 2
+    CLOCK_INTERVAL = 64  # Expansions between clock reads when stepping against a time budget
+
+    def __init__(self, algorithm, start_position, goal_position, maze):
+        """
+        One search that runs a slice at a time instead of to the end in one call.
+
+        Each step() expands a bounded number of cells and returns; the state
+        stays in the stepper, so a game can advance a search once per frame,
+        draw what it has seen so far, stop it at any point and still show
+        the best path found up to then. Searches give the same path lengths
+        as the matching AI solvers; ties between equally good cells may be
+        broken differently.
+
+        The stepper keeps its own per-cell arrays rather than the AI's
+        SearchWorkspace, since it outlives many other queries, and the
+        adjacency index of the maze version it started on.
+
+        :param algorithm: Key of SearchStepper.ALGORITHMS.
+        :param start_position: Tuple (x, y) to search from.
+        :param goal_position: Tuple (x, y) to reach.
+        :param maze: Maze instance.
+        :raises ValueError: If the algorithm has no stepper.
+        """
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"No stepper for {algorithm}; choose one of {', '.join(self.ALGORITHMS)}")
+        self.algorithm = algorithm
+        self.kind, weighted = self.ALGORITHMS[algorithm]
+        self.maze = maze
+        self.version = maze.version
+        self.offsets, self.targets = maze.adjacency()
+        self.cols = maze.cols
+        self.costs = maze.costs if weighted else None
+        size = maze.rows * maze.cols
+        self.start = start_position[1] * self.cols + start_position[0]
+        self.goal_x, self.goal_y = goal_position
+        self.goal = self.goal_y * self.cols + self.goal_x
+
+        self.state = bytearray(size)                     # UNSEEN, FRONTIER or CLOSED per cell
+        self.parent = array("i", [-1]) * size
+        self.g_cost = array("i", [0]) * size if self.kind in ("heuristic", "cost") else None
+        self.expanded = []                                # Closed cells in the order they were expanded
+        self.nodes_explored = 0
+        self.frontier_peak = 0
+        self.elapsed = 0.0                                # Seconds spent inside step()
+        self.found = False
+        self.aborted = False
+        self.closest = self.start                         # Expanded cell nearest the goal, for partial_path()
+        self._closest_distance = self._distance(self.start)
+
+        if self.kind == "queue":
+            self.frontier = deque([self.start])
+        elif self.kind == "stack":
+            self.frontier = [self.start]
+        else:
+            self.frontier = [(self._priority(0, self.start), self.start)]
+        if self.kind != "stack":
+            self.state[self.start] = self.FRONTIER      # DFS marks cells when they are expanded, like AI.dfs()
+
+    @property
+    def done(self):
+        """Whether the search has ended: goal found, frontier exhausted or aborted."""
+        return self.found or self.aborted or not self.frontier
+
+    def step(self, max_nodes=None, max_time=None):
+        """
+        Expand cells until a budget runs out or the search ends.
+
+        :param max_nodes: Most cells to expand in this call (None for no limit); skipped stale entries do not count.
+        :param max_time: Most seconds to spend in this call (None for no limit); checked every CLOCK_INTERVAL expansions.
+        :return: True once the search is done.
+        """
+        if self.done:
+            return True
+        start_time = time.perf_counter()
+        deadline = start_time + max_time if max_time is not None else None
+        budget = max_nodes if max_nodes is not None else -1
+        expand = self._expand_queue if self.kind == "queue" else \
+            self._expand_stack if self.kind == "stack" else self._expand_heap
+        frontier = self.frontier
+        while frontier and budget:
+            if len(frontier) > self.frontier_peak:
+                self.frontier_peak = len(frontier)
+            expanded = expand()
+            if expanded:
+                break
+            if expanded is None:
+                continue  # Stale entry skipped: nothing was expanded, so no budget is spent
+            budget -= 1
+            if deadline is not None and self.nodes_explored % self.CLOCK_INTERVAL == 0 \
+                    and time.perf_counter() >= deadline:
+                break
+        self.elapsed += time.perf_counter() - start_time
+        return self.done
+
+    def abort(self):
+        """Stop the search; partial_path() and result() stay available."""
+        self.aborted = True
+
+    # ------------------------------
+    # Expansion, one cell per call; True when the goal was reached, None when a stale entry was skipped
+    # ------------------------------
+    def _expand_queue(self):
+        current = self.frontier.popleft()
+        if self._close(current):
+            return True
+        state, parent = self.state, self.parent
+        for neighbor in self.targets[self.offsets[current]:self.offsets[current + 1]]:
+            if not state[neighbor]:
+                state[neighbor] = self.FRONTIER
+                parent[neighbor] = current
+                self.frontier.append(neighbor)
+        return False
+
+    def _expand_stack(self):
+        current = self.frontier.pop()
+        if self.state[current] == self.CLOSED:
+            self.nodes_explored += 1  # Counted like AI.dfs(), which counts every pop
+            return None
+        if self._close(current):
+            return True
+        state, parent = self.state, self.parent
+        for neighbor in self.targets[self.offsets[current]:self.offsets[current + 1]]:
+            if state[neighbor] != self.CLOSED:
+                state[neighbor] = self.FRONTIER
+                parent[neighbor] = current
+                self.frontier.append(neighbor)
+        return False
+
+    def _expand_heap(self):
+        _, current = heapq.heappop(self.frontier)
+        if self.state[current] == self.CLOSED:
+            return None  # Stale queue entry superseded by a cheaper one
+        if self._close(current):
+            return True
+        state, parent, g_cost, costs = self.state, self.parent, self.g_cost, self.costs
+        for neighbor in self.targets[self.offsets[current]:self.offsets[current + 1]]:
+            if state[neighbor] == self.CLOSED:
+                continue
+            tentative_g_cost = g_cost[current] + (costs[neighbor] if costs is not None else 1)
+            if not state[neighbor] or tentative_g_cost < g_cost[neighbor]:
+                state[neighbor] = self.FRONTIER
+                g_cost[neighbor] = tentative_g_cost
+                parent[neighbor] = current
+                heapq.heappush(self.frontier, (self._priority(tentative_g_cost, neighbor), neighbor))
+        return False
+
+    def _close(self, current):
+        """Mark a cell expanded and track the closest one; True if it is the goal."""
+        self.state[current] = self.CLOSED
+        self.expanded.append(current)
+        self.nodes_explored += 1
+        distance = self._distance(current)
+        if distance < self._closest_distance:
+            self.closest, self._closest_distance = current, distance
+        if current == self.goal:
+            self.found = True
+        return self.found
+
+    def _distance(self, cell):
+        y, x = divmod(cell, self.cols)
+        return abs(x - self.goal_x) + abs(y - self.goal_y)
+
+    def _priority(self, g_cost, cell):
+        return g_cost + self._distance(cell) if self.kind == "heuristic" else g_cost
+
+    # ------------------------------
+    # Results
+    # ------------------------------
+    def frontier_cells(self):
+        """Flat indices of the cells waiting in the frontier (without stale duplicates)."""
+        state, closed = self.state, self.CLOSED
+        cells = self.frontier if self.kind in ("queue", "stack") else (cell for _, cell in self.frontier)
+        return {cell for cell in cells if state[cell] != closed}
+
+    def partial_path(self):
+        """
+        Best path known so far: to the goal once found, otherwise to the expanded cell nearest the goal.
+
+        :return: List of (x, y) from start (exclusive) to that cell.
+        """
+        path = []
+        current = self.goal if self.found else self.closest
+        parent, cols = self.parent, self.cols
+        while current != self.start and current >= 0:
+            y, x = divmod(current, cols)
+            path.append((x, y))
+            current = parent[current]
+        path.reverse()
+        return path
+
+    def result(self):
+        """
+        Metrics of the search so far, with the full path if the goal was found and the partial path otherwise.
+
+        :return: AIMetrics; path_length is the terrain cost of the path, as for the AI solvers.
+        """
+        path = self.partial_path()
+        costs, cols = self.maze.costs if self.maze.max_cost > 1 else None, self.cols
+        path_length = sum(costs[y * cols + x] for x, y in path) if costs is not None else len(path)
+        return AIMetrics(
+            algorithm_name=self.algorithm,
+            path=path,
+            steps=len(path),
+            nodes_explored=self.nodes_explored,
+            path_length=path_length,
+            execution_time=self.elapsed,
+            cpu_usage=0,
+            memory_usage=0,
+            frontier_peak=self.frontier_peak,
+        )
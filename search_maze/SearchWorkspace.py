@@ -0,0 +1,58 @@
+from array import array
+
+
+class SearchWorkspace:
+    # Stamps are unsigned 32-bit; when the next mark would not fit, stamps are wiped once
+    MAX_STAMP = 0xFFFFFFFF
+
+    def __init__(self, size=0):
+        """
+        Per-cell search arrays that are reused from one query to the next.
+
+        Instead of clearing visited/parent/cost storage between searches, every
+        search starts with begin(), which returns a fresh mark. A cell counts
+        as seen in the current search when stamp[cell] >= mark and as closed
+        when stamp[cell] == mark + 1; anything older is treated as unseen, so
+        parent and cost entries are only ever read for cells stamped this time.
+
+        Arrays come in sides (0 = forward, 1 = backward for bidirectional
+        searches); the backward side is only allocated when first asked for.
+
+        :param size: Number of cells (rows * cols) of the maze.
+        """
+        self.size = 0
+        self.mark = 0
+        self.stamp = []   # Per side: array("I") of marks
+        self.parent = []  # Per side: array("i") of parent cell indices
+        self.cost = []    # Per side: array("i") of path costs
+        self.resize(size)
+
+    def resize(self, size):
+        """Reallocate for a maze with a different number of cells."""
+        sides = max(1, len(self.stamp))
+        self.size = size
+        self.mark = 0
+        self.stamp, self.parent, self.cost = [], [], []
+        self._add_sides(sides)
+
+    def begin(self, sides=1):
+        """
+        Start a new search.
+
+        :param sides: How many sides the search needs (2 for bidirectional).
+        :return: The mark identifying this search.
+        """
+        if sides > len(self.stamp):
+            self._add_sides(sides - len(self.stamp))
+        if self.mark + 3 > self.MAX_STAMP:
+            for stamp in self.stamp:
+                stamp[:] = array("I", bytes(4 * self.size))
+            self.mark = 0
+        self.mark += 2
+        return self.mark
+
+    def _add_sides(self, count):
+        for _ in range(count):
+            self.stamp.append(array("I", bytes(4 * self.size)))
+            self.parent.append(array("i", bytes(4 * self.size)))
+            self.cost.append(array("i", bytes(4 * self.size)))
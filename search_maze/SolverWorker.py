@@ -0,0 +1,100 @@
+from BatchSolver import BatchSolver
+from Instrumentation import Instrumentation
+
+
+class SolverWorker:
+    def __init__(self, processes=3):
+        """
+        Runs the game's solver queries in background processes so the frame loop never waits on a search.
+
+        submit() starts a request of one or more queries and returns at once;
+        the game calls poll() every frame and applies the results when the
+        whole request is done. Only one request is live at a time: a new
+        submit() or cancel() drops the previous one, and if its searches are
+        still running the worker processes are killed rather than left to
+        finish work nobody will look at.
+
+        The processes are one BatchSolver, started on first use and kept for
+        the whole game. A request on another maze, a newer version of it or
+        another instrumentation level only hands the batch a new snapshot,
+        which costs one copy of the grid; the processes are restarted only
+        after cancel() had to kill them.
+
+        :param processes: Number of worker processes; 3 lets "Compare all" run its searches side by side.
+        """
+        self.processes = processes
+        self.batch = None
+        self.pending = None     # AsyncResults of the live request
+        self.labels = []        # Algorithm labels of the live request, for the "searching" display
+        self.error = None       # Why the last request failed, set by poll()
+        self._workers = []      # Worker processes when the live request was submitted
+
+    @property
+    def busy(self):
+        """Whether a request is still running."""
+        return self.pending is not None
+
+    def submit(self, maze, queries, instrumentation_level=Instrumentation.OFF):
+        """
+        Start a request, dropping any earlier one.
+
+        :param maze: Maze to solve on.
+        :param queries: List of (start, goal, algorithm) tuples, see BatchSolver.solve().
+        :param instrumentation_level: Instrumentation level of the solvers.
+        """
+        self.cancel()
+        self.error = None
+        if self.batch is None:
+            self.batch = BatchSolver(maze, self.processes, instrumentation_level=instrumentation_level)
+        elif self.batch.version != maze.version:  # Versions are unique across mazes
+            self.batch.load(maze)
+        self.batch.instrumentation_level = instrumentation_level
+        self.pending = [self.batch.submit(query) for query in queries]
+        self._workers = self.batch.workers()
+        self.labels = [algorithm for _, _, algorithm in queries]
+
+    def poll(self):
+        """
+        Collect the live request's results if they are all done; never blocks.
+
+        A request fails when a query raised in its worker or a worker process
+        died under it (killed for running out of memory, say; the pool would
+        wait for its queries forever). The request is then dropped and the
+        reason left in error.
+
+        :return: List of AIMetrics in the order of the queries, or None if the request is still running, failed or there is none.
+        """
+        if self.pending is None:
+            return None
+        if not all(result.ready() for result in self.pending):
+            if any(process.exitcode is not None for process in self._workers):
+                self.cancel()
+                self.error = "a solver process died"
+            return None
+        try:
+            results = [result.get() for result in self.pending]
+        except Exception as error:
+            results = None
+            self.error = str(error) or type(error).__name__
+        self.pending = None
+        self.labels = []
+        self._workers = []
+        return results
+
+    def cancel(self):
+        """Drop the live request, killing its searches if they are still running."""
+        if self.pending is None:
+            return
+        if not all(result.ready() for result in self.pending):
+            self.batch.close(cancel=True)
+            self.batch = None
+        self.pending = None
+        self.labels = []
+        self._workers = []
+
+    def close(self):
+        """Stop the worker processes."""
+        self.pending = None
+        if self.batch is not None:
+            self.batch.close(cancel=True)
+            self.batch = None
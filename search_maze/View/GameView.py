@@ -2,6 +2,7 @@ import pygame
 from CONSTANTS import CONSTANTS
 from View.UI.Button import Button
 from View.UI.InputField import InputField
+from View.UI.MazeView import MazeView
 
 class GameView:
 
@@ -12,6 +13,7 @@ class GameView:
         :param metrics_font_size: Font size for the metrics display.
         """
         self.screen = screen
+        self.font_size = font_size
         self.font = pygame.font.Font(None, font_size)
         self.metrics_font = pygame.font.Font(None, metrics_font_size)  # Separate font for metrics
         self.buttons = []
@@ -19,8 +21,13 @@ class GameView:
         self.metrics_text = []
         self.column_start_x = CONSTANTS.SCREEN_WIDTH - CONSTANTS.RIGHT_COLUMN_WIDTH + 50
         self.column_start_y = 100
-        self.element_height = 50
+        self.element_height = 50  # Tallest a row of buttons gets; create_ui() shrinks it on short screens
         self.vertical_spacing = 10
+        self.metrics_lines = 12   # Metrics lines the layout keeps room for between the buttons and Exit
+        self.maze_view = MazeView(screen)
+        self._metric_surfaces = {}  # Metrics line -> rendered text, for the lines currently shown
+        self._drawn_metrics = None  # metrics_text the sidebar on screen shows
+        self._sidebar_full = True   # Redraw the sidebar even if nothing in it changed
         self.create_ui()
 
 
@@ -40,18 +47,78 @@ class GameView:
             y += self.element_height + self.vertical_spacing
         return positions
 
+    def _calculate_grid_positions(self, count, columns=2, width=200, start_y=None):
+        """
+        Calculate positions for elements laid out in rows of `columns` within the column width.
+        :param count: Number of elements in the grid.
+        :param columns: Number of elements per row.
+        :param width: Total width shared by one row.
+        :return: List of (x, y) positions and the width of each element.
+        """
+        if start_y is None:
+            start_y = self.column_start_y
+        cell_width = (width - (columns - 1) * self.vertical_spacing) // columns
+        positions = []
+        for i in range(count):
+            row, col = divmod(i, columns)
+            positions.append((
+                self.column_start_x + col * (cell_width + self.vertical_spacing),
+                start_y + row * (self.element_height + self.vertical_spacing),
+            ))
+        return positions, cell_width
+
+    def _fit_element_height(self, rows):
+        """
+        Row height that leaves room for the metrics and the Exit button below rows of elements.
+        :param rows: Number of element rows stacked from column_start_y.
+        :return: Height in pixels, at most the configured element_height.
+        """
+        metrics_height = self.metrics_lines * (self.metrics_font.get_linesize() + self.vertical_spacing)
+        available = CONSTANTS.SCREEN_HEIGHT - self.column_start_y - metrics_height
+        height = available // (rows + 1) - self.vertical_spacing  # One more row for Exit
+        return max(self.metrics_font.get_linesize() + 4, min(self.element_height, height))
+
+    def _fit_font(self, labels, width, height, padding=6):
+        """
+        Largest font, up to the UI font size, in which every label fits inside a button.
+        :param labels: Button labels.
+        :param width: Button width.
+        :param height: Button height.
+        :return: pygame Font.
+        """
+        for size in range(self.font_size, 12, -2):
+            font = pygame.font.Font(None, size)
+            if all(font.size(label)[0] <= width - 2 * padding and font.get_height() <= height for label in labels):
+                return font
+        return font
+
     def create_ui(self):
-        # Define buttons
-        button_labels = ["BFS", "DFS", "A*", "Regenerate"]
-        button_positions = self._calculate_column_positions(len(button_labels))
-        
+        # Define algorithm buttons, two per row to keep the column short
+        algorithm_labels = ["BFS", "DFS", "A*", "Bi-BFS", "Bi-A*", "JPS", "Dijkstra", "Terrain A*", "Hint", "D* Lite", "HPA*", "Junction"]
+        # Algorithm rows, then Compare all, Regenerate, the grid size field and the two difficulty buttons
+        self.element_height = self._fit_element_height((len(algorithm_labels) + 1) // 2 + 5)
+        algorithm_positions, algorithm_width = self._calculate_grid_positions(len(algorithm_labels))
+        algorithm_font = self._fit_font(algorithm_labels, algorithm_width, self.element_height)
+        self.font = self._fit_font(["Compare all", "Regenerate", "Increase", "Decrease", "Exit"], 200, self.element_height)
+
         self.buttons = [
-            Button(x, y, 200, self.element_height, label, self.font, CONSTANTS.BLUE, CONSTANTS.WHITE)
-            for (x, y), label in zip(button_positions, button_labels)
+            Button(x, y, algorithm_width, self.element_height, label, algorithm_font, CONSTANTS.BLUE, CONSTANTS.WHITE)
+            for (x, y), label in zip(algorithm_positions, algorithm_labels)
         ]
 
+        # Runs BFS, DFS and A* side by side in the background
+        compare_y = algorithm_positions[-1][1] + self.element_height + self.vertical_spacing
+        self.buttons.append(
+            Button(self.column_start_x, compare_y, 200, self.element_height, "Compare all", self.font, CONSTANTS.BLUE, CONSTANTS.WHITE)
+        )
+
+        regenerate_y = compare_y + self.element_height + self.vertical_spacing
+        self.buttons.append(
+            Button(self.column_start_x, regenerate_y, 200, self.element_height, "Regenerate", self.font, CONSTANTS.BLUE, CONSTANTS.WHITE)
+        )
+
         # Define input field for grid size
-        grid_size_y = button_positions[-1][1] + self.element_height + self.vertical_spacing
+        grid_size_y = regenerate_y + self.element_height + self.vertical_spacing
         self.grid_size_field = InputField(
             self.column_start_x,
             grid_size_y,
@@ -82,74 +149,113 @@ class GameView:
             CONSTANTS.WHITE,
         )
 
-    def update_metrics(self, metrics):
+    def update_metrics(self, metrics, cache=None):
         """
         Update metrics text to display in the sidebar.
         :param metrics: Instance of AIMetrics containing the metrics to display.
+        :param cache: Optional PathCache whose hit/miss counters are shown as well.
         """
         self.metrics_text = [
             f"Algorithm: {metrics.algorithm_name}",
             f"Nodes Explored: {metrics.nodes_explored}",
+        ]
+        if metrics.nodes_explored_forward is not None:
+            self.metrics_text.append(f"  Fwd/Bwd: {metrics.nodes_explored_forward}/{metrics.nodes_explored_backward}")
+        self.metrics_text += [
             f"Path Length: {metrics.path_length}",
             f"Execution Time: {metrics.execution_time:.4f}s",
-            f"Memory Usage: {metrics.memory_usage:.2f} MB",
+        ]
+        if metrics.precompute_time is not None:
+            self.metrics_text.append(f"  Prep/Query: {metrics.precompute_time:.3f}/{metrics.query_time:.3f}s")
+        if metrics.reduction_ratio is not None:
+            self.metrics_text.append(f"  Graph/Cells: {metrics.reduction_ratio:.1%}")
+        if metrics.phases is not None:
+            self.metrics_text.append(f"  CPU: {metrics.cpu_usage:.3f}s  Frontier: {metrics.frontier_peak}")
+            if metrics.expansion_rate is not None:
+                self.metrics_text.append(f"  Rate: {metrics.expansion_rate:,.0f} nodes/s")
+        self.metrics_text += [
+            f"Peak Memory: {metrics.memory_usage:.2f} MB",
             f"Total Cells: {(CONSTANTS.ROWS-2)*(CONSTANTS.COLS-2)}"
         ]
+        if cache is not None:
+            self.metrics_text.append(f"Cache: {cache.hits} hits / {cache.misses} misses")
 
-    def draw_maze(self, maze, player_pos, exit_pos, ai_path):
-        # Draw maze
-        for y in range(maze.rows):
-            for x in range(maze.cols):
-                color = CONSTANTS.WHITE if maze.maze[y][x] == 0 else CONSTANTS.BLACK
-                pygame.draw.rect(
-                    self.screen,
-                    color,
-                    (x * maze.cell_size, y * maze.cell_size, maze.cell_size, maze.cell_size)
-                )
-
-        # Draw AI path
-        for pos in ai_path:
-            pygame.draw.rect(
-                self.screen,
-                CONSTANTS.RED,
-                (pos[0] * maze.cell_size, pos[1] * maze.cell_size, maze.cell_size, maze.cell_size)
-            )
-
-        # Draw player
-        pygame.draw.rect(
-            self.screen,
-            CONSTANTS.GREEN,
-            (player_pos[0] * maze.cell_size, player_pos[1] * maze.cell_size, maze.cell_size, maze.cell_size)
-        )
+    def update_comparison(self, metrics_list):
+        """
+        Show several solvers' metrics side by side, one row per algorithm.
+        :param metrics_list: AIMetrics of the compared searches.
+        """
+        self.metrics_text = ["Algo      Nodes    Len    Time"]
+        for metrics in metrics_list:
+            self.metrics_text.append(f"{metrics.algorithm_name:<6}{metrics.nodes_explored:>9}{metrics.path_length:>7}"
+                                     f"{metrics.execution_time:>8.3f}s")
+        self.metrics_text.append(f"Total Cells: {(CONSTANTS.ROWS-2)*(CONSTANTS.COLS-2)}")
 
-        # Draw exit
-        pygame.draw.rect(
-            self.screen,
-            CONSTANTS.YELLOW,
-            (exit_pos[0] * maze.cell_size, exit_pos[1] * maze.cell_size, maze.cell_size, maze.cell_size)
-        )
+    def show_searching(self, labels):
+        """
+        Replace the metrics with a note that searches are running in the background.
+        :param labels: Algorithm labels being searched.
+        """
+        self.metrics_text = [f"Searching: {', '.join(labels)}..."]
 
-    def draw_sidebar(self):
-        # Draw right column background
-        pygame.draw.rect(self.screen, CONSTANTS.GRAY, (CONSTANTS.MAZE_WIDTH, 0, CONSTANTS.RIGHT_COLUMN_WIDTH, CONSTANTS.SCREEN_HEIGHT))
+    def show_message(self, message):
+        """
+        Replace the metrics with a one-line message, e.g. an error the player should see.
+        :param message: Text to show.
+        """
+        self.metrics_text = [message]
 
-        # Draw buttons
-        for button in self.buttons:
-            button.draw(self.screen)
+    def invalidate(self):
+        """Redraw the whole screen on the next frame, e.g. after something else drew over it."""
+        self.maze_view.invalidate()
+        self._sidebar_full = True
 
-        # Draw grid size input field
-        self.grid_size_field.draw(self.screen)
+    def draw_maze(self, maze, player_pos, exit_pos, ai_path, stepper=None):
+        """
+        Draw the maze area from its cached surface; see MazeView.draw().
+        :return: List of screen rectangles that changed.
+        """
+        return self.maze_view.draw(maze, player_pos, exit_pos, ai_path, stepper)
+
+    def _widgets(self):
+        return self.buttons + [self.grid_size_field] + self.difficulty_buttons + [self.exit_button]
 
-        # Draw difficulty buttons
-        for button in self.difficulty_buttons:
-            button.draw(self.screen)
+    def draw_sidebar(self):
+        """
+        Draw the right column if anything in it changed since the last frame.
+
+        Widgets keep their rendered surfaces and metrics lines are rendered
+        once per distinct text, so a redraw is only blits; a frame where no
+        widget and no metric changed draws nothing at all.
+        :return: List with the sidebar's screen rectangle, or an empty list if it is unchanged.
+        """
+        widgets = self._widgets()
+        if not (self._sidebar_full or self.metrics_text != self._drawn_metrics
+                or any(widget.dirty for widget in widgets)):
+            return []
+        self._sidebar_full = False
+        self._drawn_metrics = list(self.metrics_text)
+
+        # Draw right column background
+        sidebar = pygame.Rect(CONSTANTS.MAZE_WIDTH, 0, CONSTANTS.RIGHT_COLUMN_WIDTH, CONSTANTS.SCREEN_HEIGHT)
+        pygame.draw.rect(self.screen, CONSTANTS.GRAY, sidebar)
 
-        # Draw Exit button
-        self.exit_button.draw(self.screen)
+        # Draw buttons, grid size input field, difficulty buttons and Exit button
+        for widget in widgets:
+            widget.draw(self.screen)
 
-        # Display metrics text
-        metrics_y = self.difficulty_buttons[-1].rect.y + self.element_height + self.vertical_spacing
+        # Display metrics text between the last difficulty button and Exit, rendering only lines not shown before
+        surfaces = {}
+        metrics_y = self.difficulty_buttons[-1].rect.bottom + self.vertical_spacing
+        line_height = self.metrics_font.get_linesize() + self.vertical_spacing
         for metric in self.metrics_text:
-            text_surface = self.metrics_font.render(metric, True, CONSTANTS.BLACK)
+            if metrics_y + self.metrics_font.get_linesize() > self.exit_button.rect.top:
+                break  # No room left above the Exit button
+            text_surface = self._metric_surfaces.get(metric)
+            if text_surface is None:
+                text_surface = self.metrics_font.render(metric, True, CONSTANTS.BLACK)
+            surfaces[metric] = text_surface
             self.screen.blit(text_surface, (self.column_start_x, metrics_y))
-            metrics_y += self.metrics_font.get_linesize() + self.vertical_spacing
\ No newline at end of file
+            metrics_y += line_height
+        self._metric_surfaces = surfaces
+        return [sidebar]
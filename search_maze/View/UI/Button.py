@@ -7,12 +7,26 @@ class Button:
         self.font = font
         self.color = color
         self.text_color = text_color
+        self._surface = None       # Rendered button, reused until its look changes
+        self._rendered_key = None  # _key() the surface was rendered for
+
+    def _key(self):
+        return self.text, self.color, self.text_color, self.rect.size
+
+    @property
+    def dirty(self):
+        """Whether the button looks different from what it last drew."""
+        return self._key() != self._rendered_key
 
     def draw(self, screen):
-        pygame.draw.rect(screen, self.color, self.rect)
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        # Render text and background only when they changed; otherwise this is one blit
+        if self.dirty:
+            self._surface = pygame.Surface(self.rect.size)
+            self._surface.fill(self.color)
+            text_surface = self.font.render(self.text, True, self.text_color)
+            self._surface.blit(text_surface, text_surface.get_rect(center=(self.rect.width // 2, self.rect.height // 2)))
+            self._rendered_key = self._key()
+        screen.blit(self._surface, self.rect)
 
     def is_clicked(self, mouse_pos):
         return self.rect.collidepoint(mouse_pos)
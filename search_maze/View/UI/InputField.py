@@ -22,25 +22,47 @@ class InputField:
         self.active = False
         self.cursor_visible = True  # Control blinking cursor
         self.cursor_timer = 0  # Timer for cursor blinking
+        self._surface = None       # Rendered field, reused until its text or state changes
+        self._rendered_key = None  # _key() the surface was rendered for
+
+    def _key(self):
+        return (self.text, self.active and self.cursor_visible, self.text_color, self.border_color,
+                self.rect.size)
+
+    @property
+    def dirty(self):
+        """Whether the field looks different from what it last drew."""
+        return self._key() != self._rendered_key
 
     def draw(self, screen):
+        if self.dirty:
+            self._render()
+        screen.blit(self._surface, self.rect)
+
+    def _render(self):
+        surface = pygame.Surface(self.rect.size)
+        box = surface.get_rect()
+
         # Draw the white background
-        pygame.draw.rect(screen, CONSTANTS.WHITE, self.rect)
+        surface.fill(CONSTANTS.WHITE)
 
         # Draw the border
-        pygame.draw.rect(screen, self.border_color, self.rect, 2)
+        pygame.draw.rect(surface, self.border_color, box, 2)
 
         # Render the text inside the input box
         text_surface = self.font.render(self.text, True, self.text_color)
-        screen.blit(text_surface, (self.rect.x + 5, self.rect.y + (self.rect.height - text_surface.get_height()) // 2))
+        surface.blit(text_surface, (5, (box.height - text_surface.get_height()) // 2))
 
         # Draw blinking cursor if active
         if self.active and self.cursor_visible:
             # Calculate cursor position based on text width
-            cursor_x = self.rect.x + 5 + text_surface.get_width() + 2
-            cursor_y = self.rect.y + (self.rect.height - text_surface.get_height()) // 2
+            cursor_x = 5 + text_surface.get_width() + 2
+            cursor_y = (box.height - text_surface.get_height()) // 2
             cursor_height = text_surface.get_height()
-            pygame.draw.line(screen, self.text_color, (cursor_x, cursor_y), (cursor_x, cursor_y + cursor_height), 2)
+            pygame.draw.line(surface, self.text_color, (cursor_x, cursor_y), (cursor_x, cursor_y + cursor_height), 2)
+
+        self._surface = surface
+        self._rendered_key = self._key()
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
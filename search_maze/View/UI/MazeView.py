@@ -2,10 +2,233 @@
 import pygame
 from CONSTANTS import *
 
+try:
+    import numpy  # Optional: rasterizes the maze and stamps cells in bulk; without it everything is drawn with rects
+except ImportError:
+    numpy = None
+
 class MazeView:
-    def __init__(self, maze_model):
-        self.maze_model = maze_model
+    MAX_RECTS = 64    # Above this many changed cells, their bounding rectangle is pushed instead
+    BULK_CELLS = 64   # From this many cells on, _stamp() writes pixels with numpy instead of drawing each cell
+
+    def __init__(self, screen):
+        """
+        Draw the maze area from a cached surface and report which parts of the screen changed.
+
+        Walls and terrain are rendered once per maze version into a surface.
+        Every frame that surface (or, while an animated search is shown, a
+        copy with the search's progress painted in) is the background the
+        path, player and exit are drawn over. Only cells whose overlay or
+        background changed since the last frame are drawn again, and their
+        rectangles are returned for pygame.display.update().
+
+        :param screen: Pygame screen surface.
+        """
+        self.screen = screen
+        self.surface = None       # Static maze of the current version
+        self.background = None    # self.surface, or a copy carrying the animated search
+        self._key = None          # (maze version, cell size) self.surface was rendered for
+        self._stepper = None      # SearchStepper painted into self.background
+        self._expanded_drawn = 0  # Expanded cells of the stepper already painted
+        self._frontier = set()    # Frontier cells of the stepper already painted
+        self._path = None         # ai_path list drawn last frame, compared by identity
+        self._path_length = 0     # Its length then, in case the same list grew or shrank
+        self._path_cells = set()  # Its cells
+        self._player = None       # Player cell drawn last frame
+        self._exit = None         # Exit cell drawn last frame
+        self._full = True
+
+    def invalidate(self):
+        """Redraw the whole maze area on the next draw(), e.g. after something else drew over the screen."""
+        self._full = True
+
+    def render(self, maze):
+        """
+        Render walls and terrain to a new surface.
+
+        With numpy the grid is turned into pixels in one pass: wall and cost
+        values index a color lookup table, the one-pixel-per-cell image goes
+        to a surface through pygame.surfarray and a single transform.scale
+        blows it up to the cell size. Without numpy, runs of open cells of the
+        same cost along a row become one rectangle each.
+
+        :param maze: Maze to render.
+        :return: Surface of cols x rows cells.
+        """
+        if numpy is not None:
+            return self._render_pixels(maze)
+        return self._render_rects(maze)
+
+    def _render_pixels(self, maze):
+        rows, cols, size = maze.rows, maze.cols, maze.cell_size
+        walls = numpy.frombuffer(maze.cells(), dtype=numpy.uint8).reshape(rows, cols)
+        palette = numpy.array((CONSTANTS.BLACK,) + CONSTANTS.TERRAIN_COLORS[1:], dtype=numpy.uint8)  # 0 = wall
+        if maze.max_cost > 1:
+            costs = numpy.frombuffer(maze.costs, dtype=numpy.uint8).reshape(rows, cols)
+            index = numpy.where(walls, 0, numpy.minimum(costs, len(palette) - 1))
+        else:
+            index = 1 - walls  # Floor color or wall color
+        # surfarray indexes pixels as [x, y], the grid as [y, x]
+        surface = pygame.surfarray.make_surface(palette[index].transpose(1, 0, 2))
+        if size != 1:
+            surface = pygame.transform.scale(surface, (cols * size, rows * size))
+        # Match the screen's pixel format so per-cell blits from the cache need no conversion
+        return surface.convert() if pygame.display.get_surface() is not None else surface
+
+    def _render_rects(self, maze):
+        size, cols = maze.cell_size, maze.cols
+        surface = pygame.Surface((cols * size, maze.rows * size))
+        surface.fill(CONSTANTS.BLACK)
+        terrain_colors = CONSTANTS.TERRAIN_COLORS
+        costs = maze.costs if maze.max_cost > 1 else None
+        for y, row in enumerate(maze.maze):
+            x = 0
+            while x < cols:
+                if row[x]:
+                    x += 1
+                    continue
+                cost = costs[y * cols + x] if costs is not None else 1
+                end = x + 1
+                while end < cols and not row[end] and (costs is None or costs[y * cols + end] == cost):
+                    end += 1
+                color = terrain_colors[min(cost, len(terrain_colors) - 1)]
+                pygame.draw.rect(surface, color, (x * size, y * size, (end - x) * size, size))
+                x = end
+        return surface
+
+    def draw(self, maze, player_pos, exit_pos, ai_path, stepper=None):
+        """
+        Bring the maze area of the screen up to date.
+
+        :param maze: Maze to show.
+        :param player_pos: Player cell (x, y).
+        :param exit_pos: Exit cell (x, y).
+        :param ai_path: Path cells to highlight.
+        :param stepper: SearchStepper whose explored cells and frontier are shown under the path, or None.
+        :return: List of screen rectangles that changed.
+        """
+        size = maze.cell_size
+        key = (maze.version, size)
+        if key != self._key:
+            self.surface = self.render(maze)
+            self._key = key
+            self._stepper = None
+            self.background = self.surface
+            self._full = True
+        if stepper is not self._stepper:
+            self.background = self.surface.copy() if stepper is not None else self.surface
+            self._stepper, self._expanded_drawn, self._frontier = stepper, 0, set()
+            self._full = True
+        changed = self._paint_search(maze) if stepper is not None else set()
+        player, exit_cell = tuple(player_pos), tuple(exit_pos)
+        same_path = ai_path is self._path and len(ai_path) == self._path_length
+        if not (self._full or changed or not same_path or player != self._player or exit_cell != self._exit):
+            return []  # Idle frame: nothing to compare, whatever the path's length
+
+        old_cells, old_player, old_exit = self._path_cells, self._player, self._exit
+        path_cells = old_cells if same_path else set(ai_path)
+        self._path, self._path_length, self._path_cells = ai_path, len(ai_path), path_cells
+        self._player, self._exit = player, exit_cell
+
+        if self._full:
+            self._full = False
+            area = pygame.Rect(0, 0, CONSTANTS.MAZE_WIDTH, CONSTANTS.SCREEN_HEIGHT)
+            self.screen.fill(CONSTANTS.BLACK, area)
+            self.screen.blit(self.background, (0, 0))
+            # Drawn last, so the player and exit stay visible on the path
+            self._draw_overlay([(cell, CONSTANTS.RED) for cell in path_cells]
+                               + [(player, CONSTANTS.GREEN), (exit_cell, CONSTANTS.YELLOW)], size)
+            return [area]
+
+        # Only cells that joined or left the path, the player and exit cells and cells the search repainted can differ
+        candidates = set(changed)
+        if path_cells is not old_cells:
+            candidates.update(path_cells ^ old_cells)
+        candidates.update((player, exit_cell, old_player, old_exit))
+        restore, redraw = [], []
+        for cell in candidates:
+            color = self._overlay_color(cell, path_cells, player, exit_cell)
+            old_color = self._overlay_color(cell, old_cells, old_player, old_exit)
+            if color is None:
+                if old_color is not None or cell in changed:
+                    restore.append(cell)
+            elif color != old_color or cell in changed:
+                redraw.append((cell, color))
+        # Put the background back where the overlay left or the search changed it, then draw what is new
+        self._stamp(self.screen, restore, size, source=self.background)
+        self._draw_overlay(redraw, size)
+        rects = [pygame.Rect(x * size, y * size, size, size) for x, y in restore]
+        rects.extend(pygame.Rect(x * size, y * size, size, size) for (x, y), _ in redraw)
+        if len(rects) > self.MAX_RECTS:
+            return [rects[0].unionall(rects[1:])]
+        return rects
+
+    @staticmethod
+    def _overlay_color(cell, path_cells, player, exit_cell):
+        """Color drawn over a cell, or None where the background shows; the exit wins over the player, the player over the path."""
+        if cell == exit_cell:
+            return CONSTANTS.YELLOW
+        if cell == player:
+            return CONSTANTS.GREEN
+        return CONSTANTS.RED if cell in path_cells else None
+
+    def _paint_search(self, maze):
+        """
+        Paint the stepper's progress since the last frame into the background.
+
+        :return: Set of (x, y) cells that changed.
+        """
+        stepper, size, cols = self._stepper, maze.cell_size, maze.cols
+        expanded = stepper.expanded[self._expanded_drawn:]
+        self._expanded_drawn = len(stepper.expanded)
+        frontier = stepper.frontier_cells()
+        changed = set()
+        for cells, color in ((expanded, CONSTANTS.VISITED_COLOR), (frontier - self._frontier, CONSTANTS.FRONTIER_COLOR)):
+            positions = [(cell % cols, cell // cols) for cell in cells]
+            self._stamp(self.background, positions, size, color=color)
+            changed.update(positions)
+        self._frontier = frontier
+        return changed
+
+    def _draw_overlay(self, cells, size):
+        """Draw (cell, color) pairs on the screen, grouped by color so long paths are stamped in bulk."""
+        by_color = {}
+        for cell, color in cells:
+            by_color.setdefault(color, []).append(cell)
+        for color, positions in by_color.items():
+            self._stamp(self.screen, positions, size, color=color)
+
+    def _stamp(self, target, cells, size, color=None, source=None):
+        """
+        Fill whole cells of a surface with a color, or copy them from a source surface of the same layout.
+
+        Many cells at once are written through pygame.surfarray with numpy
+        fancy indexing; few cells, or surfaces surfarray cannot map, are
+        drawn one by one.
 
-    def draw(self, screen, player_pos, exit_pos, ai_path):
-        # Implement drawing logic using self.maze_model
-        pass
\ No newline at end of file
+        :param target: Surface to paint.
+        :param cells: List of (x, y) cells.
+        :param size: Cell size in pixels.
+        :param color: RGB color, or None to copy from source.
+        :param source: Surface to copy the cells from when color is None.
+        """
+        if numpy is not None and len(cells) >= self.BULK_CELLS:
+            try:
+                pixels = pygame.surfarray.pixels3d(target)
+                source_pixels = pygame.surfarray.pixels3d(source) if color is None else None
+            except (ValueError, pygame.error):
+                pass  # 8- or 16-bit surface: no direct pixel access
+            else:
+                offsets = numpy.arange(size)
+                positions = numpy.array(cells, dtype=numpy.intp) * size
+                xs = (positions[:, 0, None] + offsets)[:, :, None]  # (cells, size, 1)
+                ys = (positions[:, 1, None] + offsets)[:, None, :]  # (cells, 1, size)
+                pixels[xs, ys] = source_pixels[xs, ys] if color is None else color
+                del pixels, source_pixels  # Unlock the surfaces before anything blits them
+                return
+        for x, y in cells:
+            rect = (x * size, y * size, size, size)
+            if color is None:
+                target.blit(source, rect, rect)
+            else:
+                pygame.draw.rect(target, color, rect)
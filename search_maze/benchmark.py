@@ -0,0 +1,250 @@
+"""
+Headless solver benchmark.
+
+Generates seeded mazes for a ladder of grid sizes, runs every AI algorithm
+on each of them several times and reports median/p95 latency, nodes
+explored, nodes per second and peak traced memory. Results are written as
+JSON; --compare checks them against an earlier results file and exits with
+status 1 when a solver got slower or hungrier than the allowed threshold.
+
+The cold import time of the solver core (Maze and AI) is measured as well,
+in fresh interpreters, since worker processes pay it on every start. The
+core must not pull in pygame or psutil; if it does, that is a regression.
+
+Run from search_maze/:
+
+    python benchmark.py --sizes 10 50 100 --output baseline.json
+    python benchmark.py --sizes 10 50 100 --compare baseline.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# No window is ever opened, but make sure SDL never looks for a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from AI import AI
+from Instrumentation import Instrumentation
+from Maze import Maze
+
+
+DEFAULT_SIZES = (10, 25, 50, 100, 250, 500, 1000)
+HEAVY_MODULES = ("pygame", "psutil", "numpy")  # Must stay out of the core's import graph
+IMPORT_SLACK = 0.005  # Import times are a few ms; smaller changes than this are noise
+CASE_SLACK = {"median_time": 0.001, "peak_memory_mb": 0.25}  # Same for per-case medians (s) and peaks (MB)
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of a list of numbers.
+
+    :param values: Non-empty list of numbers.
+    :param fraction: Percentile as a fraction, e.g. 0.95.
+    :return: The smallest value with at least that fraction of values at or below it.
+    """
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
+
+
+def measure_import(runs=5):
+    """
+    Time a cold import of the solver core in fresh interpreters.
+
+    :param runs: Number of interpreters to start.
+    :return: Dict with the median import time in seconds and any heavy modules the core loaded.
+    """
+    code = ("import sys, time\n"
+            "start_time = time.perf_counter()\n"
+            "import Maze, AI\n"
+            "print(time.perf_counter() - start_time)\n"
+            f"print(' '.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))\n")
+    times, heavy = [], set()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout.splitlines()
+        times.append(float(output[0]))
+        heavy.update(output[1].split() if len(output) > 1 else [])
+    return {"median_time": percentile(times, 0.5), "heavy_modules": sorted(heavy)}
+
+
+def run_case(algorithm, size, seeds, repeats, terrain_density, generator):
+    """
+    Benchmark one algorithm on one grid size.
+
+    Every seed gets a fresh maze and a fresh AI, so per-maze preprocessing
+    (HPA*, Junction, the Hint distance field, D* Lite's first search) shows
+    up in cold_time and later repeats measure warm queries. Timed runs use
+    Instrumentation.OFF; one extra run per seed at Instrumentation.MEMORY
+    measures the peak allocation, since tracing slows the search down.
+
+    Seeds whose maze walls the goal off from the start are not timed: a
+    search that gives up early would drag the median down. They are listed
+    under "unreachable_seeds", and if no seed is left the timings are None.
+
+    :param algorithm: Key of AI.ALGORITHMS.
+    :param size: Rows and columns of the maze.
+    :param seeds: Iterable of maze seeds.
+    :param repeats: Timed runs per seed.
+    :param terrain_density: Passed to Maze.
+    :param generator: Key of Maze.GENERATORS.
+    :return: Dict with the aggregated numbers for this case.
+    """
+    method = AI.ALGORITHMS[algorithm]
+    start, goal = (1, 1), (size - 2, size - 2)
+    times, cold_times, nodes, peaks, lengths, unreachable = [], [], [], [], [], []
+    for seed in seeds:
+        maze = Maze(size, size, 1, terrain_density=terrain_density, seed=seed, generator=generator)
+        if not maze.is_connected(start, goal):
+            unreachable.append(seed)
+            continue
+        ai = AI(start, goal)
+        solver = getattr(ai, method)  # Called directly: PathCache would turn repeats into lookups
+        for repeat in range(repeats):
+            start_time = time.perf_counter()
+            metrics = solver(start, maze)
+            elapsed = time.perf_counter() - start_time
+            if repeat == 0:
+                cold_times.append(elapsed)
+            times.append(elapsed)
+            nodes.append(metrics.nodes_explored)
+        lengths.append(metrics.path_length)
+        ai.instrumentation.level = Instrumentation.MEMORY
+        peaks.append(solver(start, maze).memory_usage)
+
+    if not times:
+        return {"algorithm": algorithm, "size": size, "runs": 0, "median_time": None, "p95_time": None,
+                "cold_time": None, "nodes_explored": None, "nodes_per_sec": None, "peak_memory_mb": None,
+                "path_length": None, "unreachable_seeds": unreachable}
+    median = percentile(times, 0.5)
+    median_nodes = percentile(nodes, 0.5)
+    return {
+        "algorithm": algorithm,
+        "size": size,
+        "runs": len(times),
+        "median_time": median,
+        "p95_time": percentile(times, 0.95),
+        "cold_time": percentile(cold_times, 0.5),
+        "nodes_explored": median_nodes,
+        "nodes_per_sec": median_nodes / median if median > 0 else None,
+        "peak_memory_mb": max(peaks),
+        "path_length": percentile(lengths, 0.5),
+        "unreachable_seeds": unreachable,
+    }
+
+
+def run(sizes, algorithms, seeds, repeats, terrain_density, generator, log=sys.stderr):
+    """
+    Benchmark every algorithm on every size.
+
+    :return: Results document with "meta" and "results" keys, ready for json.dump.
+    """
+    core_import = measure_import()
+    print(f"core import {core_import['median_time'] * 1000:.1f} ms"
+          f"{'  loads ' + ', '.join(core_import['heavy_modules']) if core_import['heavy_modules'] else ''}", file=log)
+    results = []
+    for size in sizes:
+        for algorithm in algorithms:
+            case = run_case(algorithm, size, seeds, repeats, terrain_density, generator)
+            results.append(case)
+            skipped = f"  unreachable seeds {case['unreachable_seeds']}" if case["unreachable_seeds"] else ""
+            if not case["runs"]:
+                print(f"{size:>5} {algorithm:<10} no reachable maze{skipped}", file=log)
+                continue
+            print(f"{size:>5} {algorithm:<10} median {case['median_time'] * 1000:9.2f} ms"
+                  f"  p95 {case['p95_time'] * 1000:9.2f} ms  nodes {case['nodes_explored']:>9}"
+                  f"  peak {case['peak_memory_mb']:7.2f} MB{skipped}", file=log)
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "seeds": list(seeds),
+            "repeats": repeats,
+            "terrain_density": terrain_density,
+            "generator": generator,
+        },
+        "import": core_import,
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Flag cases that regressed against a baseline results document.
+
+    A case regresses when its median time or peak memory exceeds the
+    baseline's by more than threshold (a fraction) and by more than its
+    CASE_SLACK, so sub-millisecond cases do not trip on timer noise. Cases
+    missing from either side, or without a reachable maze on either side,
+    are skipped. A change in nodes explored is reported as a note, since it
+    means the solver's behavior changed, not just its speed.
+
+    :param results: Current results document.
+    :param baseline: Earlier results document.
+    :param threshold: Allowed relative slowdown, e.g. 0.1 for 10%.
+    :return: List of human-readable regression lines (empty if none).
+    """
+    previous = {(case["algorithm"], case["size"]): case for case in baseline["results"]}
+    regressions = []
+    core_import, old_import = results["import"], baseline.get("import")
+    if core_import["heavy_modules"]:
+        regressions.append(f"core import loads {', '.join(core_import['heavy_modules'])}")
+    if old_import is not None and core_import["median_time"] > max(old_import["median_time"] * (1 + threshold),
+                                                                   old_import["median_time"] + IMPORT_SLACK):
+        regressions.append(f"core import {old_import['median_time']:.4f}s -> {core_import['median_time']:.4f}s")
+    for case in results["results"]:
+        old = previous.get((case["algorithm"], case["size"]))
+        if old is None or not case["runs"] or not old.get("runs"):
+            continue
+        label = f"{case['algorithm']} @ {case['size']}"
+        for key, unit in (("median_time", "s"), ("peak_memory_mb", "MB")):
+            if case[key] > max(old[key] * (1 + threshold), old[key] + CASE_SLACK[key]):
+                growth = f" (+{case[key] / old[key] - 1:.0%})" if old[key] > 0 else ""
+                regressions.append(f"{label}: {key} {old[key]:.4f}{unit} -> {case[key]:.4f}{unit}{growth}")
+        if case["nodes_explored"] != old["nodes_explored"]:
+            print(f"note: {label}: nodes explored {old['nodes_explored']} -> {case['nodes_explored']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze solvers without a display.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Grid sizes (rows = cols) to benchmark.")
+    parser.add_argument("--algorithms", nargs="+", default=list(AI.ALGORITHMS), choices=list(AI.ALGORITHMS),
+                        metavar="ALGORITHM", help="Algorithm labels, as on the buttons (default: all).")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2], help="Maze seeds.")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per maze.")
+    parser.add_argument("--terrain", type=float, default=0.0, help="Terrain density of the mazes.")
+    parser.add_argument("--generator", default="backtracker", choices=list(Maze.GENERATORS),
+                        help="Maze generator (default: backtracker).")
+    parser.add_argument("--output", default="benchmark.json", help="Where to write the results.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Results file to check for regressions against.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative regression (default 0.1).")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.algorithms, args.seeds, args.repeats, args.terrain, args.generator)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,9 @@
+import multiprocessing
+
 from MazeGame import MazeGame
 
 ### --- RUN THE GAME --- ###
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Lets a frozen build start solver workers instead of another game
     game = MazeGame()
     game.run()
\ No newline at end of file